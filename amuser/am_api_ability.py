@@ -4,13 +4,23 @@ This module contains the ``ArchivematicaAPIAbility`` class, which represents a
 user's ability to use Archivematica's APIs to interact with Archivematica.
 """
 
+import base64
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import logging
 import os
+import re
+import threading
 import time
 
+from lxml import etree
 import requests
 
 from . import base
+from . import constants as c
+from . import http_client
+from . import status_watcher
+from . import utils
 
 
 logger = logging.getLogger('amuser.api')
@@ -20,91 +30,877 @@ class ArchivematicaAPIAbilityError(base.ArchivematicaUserError):
     pass
 
 
+# Per-run caches of the SS's transfer source locations (keyed by SS URL) and
+# of the listings of their directories (keyed by SS URL, location UUID and
+# path). Transfer sources do not change during a test run.
+_TRANSFER_SOURCE_LOCATIONS = {}
+_LOCATION_LISTINGS = {}
+_LOCATIONS_CACHE_LOCK = threading.Lock()
+
+# Per-run memo of the UUIDs of the SIPs created from transfers, keyed by
+# dashboard URL and transfer name. Transfer names are unique within a run, so
+# an entry only goes stale when its SIP is re-ingested.
+_SIP_UUIDS = {}
+_SIP_UUIDS_LOCK = threading.Lock()
+
+
 class ArchivematicaAPIAbility(base.Base):
     """Represents an Archivematica (AM) user's ability to use AM's APIs to
     interact with AM.
     """
 
-    def download_aip(self, transfer_name, sip_uuid, ss_api_key):
+    @property
+    def status_watcher(self):
+        """The ``StatusWatcher`` that polls this dashboard's status JSON on
+        behalf of all waiters (of all users of this dashboard). It polls every
+        ``quick_wait`` seconds, backing off to ``pessimistic_wait`` while
+        nothing changes.
+        """
+        return status_watcher.get_status_watcher(
+            (self.am_url, self.am_username), self.get_unit_statuses,
+            self.quick_wait, max_interval=self.pessimistic_wait)
+
+    def get_unit_statuses(self, unit_type='transfer'):
+        """Return the list of transfers or SIPs (depending on ``unit_type``)
+        in the dashboard's status JSON.
+        """
+        url = self.get_transfer_status_url()
+        if unit_type != 'transfer':
+            url = self.get_ingest_status_url()
+        r = self.am_http_get(url)
+        if not r.ok:
+            raise ArchivematicaAPIAbilityError(
+                'Got status code {} when requesting {}'.format(
+                    r.status_code, url))
+        return r.json().get('objects', [])
+
+    def get_unit_status(self, unit_uuid, unit_type='transfer'):
+        """Return the dict representing the transfer or SIP (depending on
+        ``unit_type``) with UUID ``unit_uuid`` in the dashboard's status JSON,
+        or ``None`` if the dashboard does not list it (yet).
+        """
+        return find_unit(self.get_unit_statuses(unit_type), unit_uuid)
+
+    def get_unit_job(self, ms_name, group_name, unit_uuid,
+                     unit_type='transfer'):
+        """Return a dict with the ``uuid``, ``name``, ``group_name`` and
+        ``current_step`` (e.g., "Completed successfully") of the job
+        representing the execution of micro-service ``ms_name`` in group
+        ``group_name`` on unit ``unit_uuid``, or ``None``.
+        """
+        return find_unit_job(self.get_unit_status(unit_uuid, unit_type),
+                             ms_name, group_name)
+
+    def await_job(self, ms_name, unit_uuid, unit_type='transfer',
+                  job_outputs=c.JOB_OUTPUTS_COMPLETE, timeout=None):
+        """Wait for the job representing the execution of micro-service
+        ``ms_name`` on unit ``unit_uuid`` to have one of ``job_outputs`` and
+        return ``(job_uuid, job_output)``. The dashboard's status JSON is
+        polled by the shared status watcher; no browser is needed.
+        """
+        return self.watch_job(ms_name, unit_uuid, unit_type=unit_type,
+                              job_outputs=job_outputs,
+                              timeout=timeout).result()
+
+    def watch_job(self, ms_name, unit_uuid, unit_type='transfer',
+                  job_outputs=c.JOB_OUTPUTS_COMPLETE, timeout=None):
+        """Non-blocking version of ``await_job``: return a future that
+        resolves to ``(job_uuid, job_output)``.
+        """
+        ms_name = utils.normalize_ms_name(ms_name, self.vn)
+        ms_name, group_name = utils.micro_service2group(ms_name)
+        if timeout is None:
+            timeout = self.max_check_for_ms_group_attempts * self.quick_wait
+        status_unit_type = {'transfer': 'transfer'}.get(unit_type, 'ingest')
+        logger.info('Waiting for job %s (%s) of %s %s to be one of %s',
+                    ms_name, group_name, unit_type, unit_uuid, job_outputs)
+
+        def predicate(statuses):
+            job = find_unit_job(
+                find_unit(statuses[status_unit_type], unit_uuid),
+                ms_name, group_name)
+            if job and job['current_step'] in job_outputs:
+                return job['uuid'], job['current_step']
+            return None
+
+        return self.status_watcher.watch(
+            predicate, unit_types=(status_unit_type,), timeout=timeout,
+            description='job {} of {} {} to be one of {}'.format(
+                ms_name, unit_type, unit_uuid, job_outputs))
+
+    def watch_sip(self, transfer_name, timeout=None, exclude_uuids=()):
+        """Return a future that resolves to the UUID of the SIP created from
+        the transfer named ``transfer_name``, once it appears in the
+        dashboard's ingest status JSON. SIPs whose UUIDs are in
+        ``exclude_uuids`` (e.g., SIPs that existed before the transfer was
+        started) are ignored. By default we wait as long as we would for a
+        job.
+        """
+        if timeout is None:
+            timeout = self.max_check_for_ms_group_attempts * self.quick_wait
+        exclude_uuids = frozenset(exclude_uuids)
+
+        def predicate(statuses):
+            for unit in statuses['ingest']:
+                if unit['uuid'] in exclude_uuids:
+                    continue
+                directory = unit.get('directory', '')
+                if directory in (transfer_name, '{}-{}'.format(
+                        transfer_name, unit['uuid'])):
+                    return unit['uuid']
+            return None
+
+        return self.status_watcher.watch(
+            predicate, unit_types=('ingest',), timeout=timeout,
+            description='SIP of transfer {}'.format(transfer_name))
+
+    def get_sip_uuid(self, transfer_name, timeout=None):
+        """Return the UUID of the SIP created from the transfer named
+        ``transfer_name``, waiting for it to appear in the dashboard's ingest
+        status JSON if necessary. The result is memoized for the rest of the
+        run.
+        """
+        key = (self.am_url, transfer_name)
+        with _SIP_UUIDS_LOCK:
+            sip_uuid = _SIP_UUIDS.get(key)
+        if sip_uuid:
+            return sip_uuid
+        sip_uuid = self.watch_sip(transfer_name, timeout=timeout).result()
+        self.remember_sip_uuid(transfer_name, sip_uuid)
+        return sip_uuid
+
+    def remember_sip_uuid(self, transfer_name, sip_uuid):
+        with _SIP_UUIDS_LOCK:
+            _SIP_UUIDS[(self.am_url, transfer_name)] = sip_uuid
+
+    def forget_sip_uuid(self, sip_uuid):
+        """Forget which transfer SIP ``sip_uuid`` came from, e.g., because it
+        is being re-ingested.
+        """
+        with _SIP_UUIDS_LOCK:
+            for key, val in list(_SIP_UUIDS.items()):
+                if key[0] == self.am_url and val == sip_uuid:
+                    del _SIP_UUIDS[key]
+
+    def get_store_aip_job_uuid(self, sip_uuid):
+        """Return the UUID of the "Store AIP" decision job of SIP
+        ``sip_uuid``, or ``None`` if it has not appeared yet. A re-ingest gets
+        a new job, so the most recent one identifies the version of the SIP's
+        METS file.
+        """
+        ms_name = utils.normalize_ms_name('Store AIP (review)', self.vn)
+        ms_name, group_name = utils.micro_service2group(ms_name)
+        jobs = find_unit_jobs(self.get_unit_status(sip_uuid, 'ingest'),
+                              ms_name, group_name)
+        if not jobs:
+            return None
+        return get_latest_job(jobs)['uuid']
+
+    def download_mets(self, transfer_name, sip_uuid, parse_xml=True):
+        """Download the METS file of the AIP of SIP ``sip_uuid`` (created
+        from the transfer ``transfer_name``) while it awaits the "Store AIP"
+        decision. The file is streamed from the dashboard's file system
+        download endpoint and parsed incrementally. Return an lxml instance
+        or, if ``parse_xml`` is ``False``, a string. Return ``None`` if the
+        METS file cannot be downloaded.
+        """
+        mets_path = os.path.join(
+            c.AM_SHARED_DIR, 'watchedDirectories', 'storeAIP',
+            '{}-{}'.format(transfer_name, sip_uuid),
+            'METS.{}.xml'.format(sip_uuid))
+        r = self.am_http_get(
+            self.get_download_fs_url(),
+            params={'filepath': base64.b64encode(
+                mets_path.encode('utf8')).decode('ascii')},
+            stream=True)
+        with r:
+            if not r.ok:
+                logger.info('Unable to download METS file %s; got status code'
+                            ' %s', mets_path, r.status_code)
+                return None
+            chunks = r.iter_content(chunk_size=c.DOWNLOAD_CHUNK_SIZE)
+            if not parse_xml:
+                return b''.join(chunks).decode('utf8')
+            parser = etree.XMLParser(huge_tree=True)
+            try:
+                for chunk in chunks:
+                    parser.feed(chunk)
+                return parser.close()
+            except etree.XMLSyntaxError as exc:
+                logger.info('Unable to parse METS file %s: %s', mets_path, exc)
+                return None
+
+    def execute_choice(self, job_uuid, choice):
+        """Make the choice with value ``choice`` (e.g., a chain UUID) at the
+        decision point job with UUID ``job_uuid``, the way the dashboard's
+        Transfer and Ingest tabs do it.
+        """
+        url = self.get_mcp_execute_url()
+        for refresh in (False, True):
+            s = self.get_am_http_session(refresh=refresh)
+            r = s.post(url, data={'uuid': job_uuid, 'choice': choice},
+                       headers={'X-CSRFToken': s.cookies.get('csrftoken', ''),
+                                'Referer': self.get_transfer_url()})
+            if not r.url.startswith(self.get_login_url()):
+                break
+        if not r.ok:
+            raise ArchivematicaAPIAbilityError(
+                'Unable to make choice {} at job {}; the dashboard returned'
+                ' status code {}'.format(choice, job_uuid, r.status_code))
+
+    def get_am_api_auth(self):
+        """Return the Requests auth object that authenticates requests to the
+        dashboard API using the user's AM API key.
+        """
+        if not self.am_api_key:
+            raise ArchivematicaAPIAbilityError(
+                'An Archivematica API key is required in order to use the'
+                ' dashboard API; supply one with ``-D am_api_key=<KEY>``.')
+        return http_client.ApiKeyAuth(self.am_username, self.am_api_key)
+
+    def get_transfer_source_locations(self):
+        """Return the enabled transfer source (TS) locations of the SS."""
+        with _LOCATIONS_CACHE_LOCK:
+            locations = _TRANSFER_SOURCE_LOCATIONS.get(self.ss_url)
+        if locations is not None:
+            return locations
+        r = self.ss_http_get(self.get_ss_api_locations_url(),
+                             params={'purpose': 'TS', 'enabled': 'true'})
+        if not r.ok:
+            raise ArchivematicaAPIAbilityError(
+                'Unable to get the transfer source locations from the SS;'
+                ' got status code {}'.format(r.status_code))
+        locations = r.json().get('objects', [])
+        with _LOCATIONS_CACHE_LOCK:
+            _TRANSFER_SOURCE_LOCATIONS[self.ss_url] = locations
+        return locations
+
+    def browse_location(self, location, path=''):
+        """Return the names of the entries (files and directories) and of
+        the directories at ``path`` (relative) in the SS location ``location``
+        (a dict from the SS locations API). Listings are cached for the rest of
+        the run. Raise ``ArchivematicaAPIAbilityError`` if the SS cannot list
+        ``path``; failed listings are not cached.
+        """
+        key = (self.ss_url, location['uuid'], path.strip('/'))
+        with _LOCATIONS_CACHE_LOCK:
+            listing = _LOCATION_LISTINGS.get(key)
+        if listing is not None:
+            return listing
+        abs_path = os.path.join(location['path'], path.strip('/'))
+        r = self.ss_http_get(
+            self.get_ss_api_location_browse_url(location['uuid']),
+            params={'path': base64.b64encode(
+                abs_path.encode('utf8')).decode('ascii')})
+        if not r.ok:
+            raise ArchivematicaAPIAbilityError(
+                'Unable to browse {} in location {}; the SS API returned'
+                ' status code {}'.format(
+                    abs_path, location['uuid'], r.status_code))
+        listing = tuple(
+            [base64.b64decode(name).decode('utf8')
+             for name in r.json().get(attr, [])]
+            for attr in ('entries', 'directories'))
+        with _LOCATIONS_CACHE_LOCK:
+            _LOCATION_LISTINGS[key] = listing
+        return listing
+
+    def get_transfer_source_location(self, transfer_path):
+        """Return the transfer source location (a dict from the SS locations
+        API) that contains ``transfer_path``, which is relative to the transfer
+        sources, as in the Transfer tab's file explorer.
+        """
+        locations = self.get_transfer_source_locations()
+        if len(locations) == 1:
+            return locations[0]
+        top_dir = transfer_path.strip('/').split('/')[0]
+        for location in locations:
+            _, directories = self.browse_location(location)
+            if top_dir in directories:
+                return location
+        raise ArchivematicaAPIAbilityError(
+            'Unable to find a transfer source location containing {}'.format(
+                transfer_path))
+
+    def validate_transfer_source_path(self, transfer_path):
+        """Make sure that ``transfer_path`` exists in the transfer sources
+        and return the transfer source location that contains it. Raise
+        ``ArchivematicaAPIAbilityError`` immediately if it does not exist. The
+        last part of the path may be a file, e.g., a zipped bag.
+        """
+        location = self.get_transfer_source_location(transfer_path)
+        parts = transfer_path.strip('/').split('/')
+        for index, part in enumerate(parts):
+            entries, directories = self.browse_location(
+                location, '/'.join(parts[:index]))
+            if part not in (entries if index == len(parts) - 1
+                            else directories):
+                raise ArchivematicaAPIAbilityError(
+                    'There is no {} in transfer source directory "{}";'
+                    ' transfer source path {} does not exist'.format(
+                        part, '/'.join(parts[:index]), transfer_path))
+        return location
+
+    def start_transfer(self, transfer_path, transfer_name, accession_no=None,
+                       transfer_type=None):
+        """Start and approve a new transfer with name ``transfer_name`` from
+        directory ``transfer_path`` using the dashboard API. Parameters and
+        return value are as for the browser ability's ``start_transfer``,
+        i.e., return ``(transfer_uuid, transfer_name)``.
+        """
+        transfer_type = transfer_type or 'Standard'
+        if transfer_type == 'Zipped bag':
+            transfer_name = os.path.splitext(
+                os.path.basename(transfer_path))[0]
+        location = self.validate_transfer_source_path(transfer_path)
+        path = '{}:{}'.format(location['uuid'], transfer_path.strip('/'))
+        data = {
+            'name': transfer_name,
+            'type': c.TRANSFER_TYPES2API_TYPES[transfer_type],
+            'accession': accession_no or '',
+            'paths[]': [base64.b64encode(path.encode('utf8')).decode('ascii')],
+            'row_ids[]': [''],
+        }
+        r = self.http_client.post(self.get_api_start_transfer_url(),
+                                  data=data, auth=self.get_am_api_auth())
+        if not r.ok:
+            raise ArchivematicaAPIAbilityError(
+                'Unable to start transfer {}; the dashboard API returned'
+                ' status code {} and message {}'.format(
+                    transfer_name, r.status_code, r.text))
+        # Archivematica may have altered the name, e.g., to make it unique.
+        directory = os.path.basename(r.json()['path'].rstrip('/'))
+        if transfer_type != 'Zipped bag':
+            transfer_name = directory
+        transfer_uuid = self.approve_transfer(directory, transfer_type)
+        logger.info('Started transfer %s (%s) via the dashboard API',
+                    transfer_name, transfer_uuid)
+        return transfer_uuid, transfer_name
+
+    def approve_transfer(self, directory, transfer_type='Standard'):
+        """Approve the transfer in ``directory`` using the dashboard API and
+        return its UUID. The transfer can only be approved once it reaches the
+        approval decision point, so we retry with exponential backoff.
+        """
+        data = {'type': c.TRANSFER_TYPES2API_TYPES[transfer_type],
+                'directory': directory}
+        deadline = time.time() + (
+            self.max_check_transfer_appeared_attempts * self.quick_wait)
+        for delay in utils.backoff_delays(self.quick_wait,
+                                          self.pessimistic_wait):
+            r = self.http_client.post(self.get_api_approve_transfer_url(),
+                                      data=data, auth=self.get_am_api_auth())
+            if r.ok:
+                return r.json()['uuid']
+            if time.time() + delay > deadline:
+                raise ArchivematicaAPIAbilityError(
+                    'Unable to approve transfer {}; the dashboard API returned'
+                    ' status code {} and message {}'.format(
+                        directory, r.status_code, r.text))
+            time.sleep(delay)
+
+    def get_completed_units(self, unit_type='transfer'):
+        """Return the UUIDs of the completed transfers or SIPs (depending on
+        ``unit_type``) using the dashboard API.
+        """
+        url = self.get_api_completed_units_url(unit_type)
+        r = self.http_client.get(url, auth=self.get_am_api_auth())
+        if not r.ok:
+            raise ArchivematicaAPIAbilityError(
+                'Unable to list completed {}s; the dashboard API returned'
+                ' status code {}'.format(unit_type, r.status_code))
+        return r.json().get('results', [])
+
+    def remove_unit(self, unit_uuid, unit_type='transfer'):
+        """Remove (i.e., hide) a transfer or SIP from the dashboard using the
+        dashboard API. Return ``True`` on success.
+        """
+        url = self.get_api_delete_unit_url(unit_type, unit_uuid)
+        r = self.http_client.delete(url, auth=self.get_am_api_auth())
+        if not r.ok:
+            logger.warning('Unable to remove %s %s; the dashboard API returned'
+                           ' status code %s', unit_type, unit_uuid,
+                           r.status_code)
+        return r.ok
+
+    def remove_completed_units(self, unit_type='transfer',
+                               concurrency=c.MAX_CONCURRENT_UNIT_REMOVALS):
+        """Remove all completed transfers or SIPs from the dashboard, at
+        most ``concurrency`` at a time, and return the UUIDs of the removed
+        units.
+        """
+        unit_uuids = self.get_completed_units(unit_type)
+        if not unit_uuids:
+            return []
+        logger.info('Removing %s completed %ss', len(unit_uuids), unit_type)
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            removed = list(executor.map(
+                lambda unit_uuid: self.remove_unit(unit_uuid, unit_type),
+                unit_uuids))
+        failures = removed.count(False)
+        if failures:
+            raise ArchivematicaAPIAbilityError(
+                'Unable to remove {} of {} completed {}s'.format(
+                    failures, len(unit_uuids), unit_type))
+        return unit_uuids
+
+    def remove_all_transfers(self):
+        """Remove all completed transfers from the Transfer tab."""
+        return self.remove_completed_units('transfer')
+
+    def remove_all_ingests(self):
+        """Remove all completed SIPs from the Ingest tab."""
+        return self.remove_completed_units('ingest')
+
+    def get_ss_api_auth(self, ss_api_key):
+        """Return the Requests auth object that authenticates requests to the
+        SS API using the SS API key ``ss_api_key``, which keeps the key out of
+        URLs (and so out of logs).
+        """
+        return http_client.ApiKeyAuth(self.ss_username, ss_api_key)
+
+    def download_aip(self, transfer_name, sip_uuid, ss_api_key, verify=None):
         """Use the AM SS API to download the completed AIP.
-        Calls http://localhost:8000/api/v2/file/<SIP-UUID>/download/\
-                  ?username=<SS-USERNAME>&api_key=<SS-API-KEY>
+        Calls http://localhost:8000/api/v2/file/<SIP-UUID>/download/
+        If ``verify`` (by default, the ``verify_aip_downloads`` setting) is
+        ``True`` and the AIP is compressed, the checksum of the download is
+        compared with the fixity recorded in the AIP's pointer file (see
+        ``get_aip_fixity``).
         """
-        payload = {'username': self.ss_username, 'api_key': ss_api_key}
+        if verify is None:
+            verify = self.verify_aip_downloads
         url = '{}api/v2/file/{}/download/'.format(self.ss_url, sip_uuid)
         aip_name = '{}-{}.7z'.format(transfer_name, sip_uuid)
         aip_path = os.path.join(self.tmp_path, aip_name)
-        max_attempts = self.max_download_aip_attempts
-        attempt = 0
-        while True:
-            r = requests.get(url, params=payload, stream=True)
-            if r.ok:
-                _save_download(r, aip_path)
-                return aip_path
-            elif r.status_code in (404, 500) and attempt < max_attempts:
-                logger.warning(
-                    'Trying again to download AIP %s via GET request to URL %s;'
-                    ' SS returned status code %s and message %s',
-                    sip_uuid, url, r.status_code, r.text)
-                attempt += 1
-                time.sleep(self.optimistic_wait)
-            else:
-                logger.warning('Unable to download AIP %s via GET request to'
-                               ' URL %s; SS returned status code %s and message'
-                               ' %s', sip_uuid, url, r.status_code, r.text)
-                raise ArchivematicaAPIAbilityError(
-                    'Unable to download AIP {}'.format(sip_uuid))
+        fixity = None
+        if verify:
+            fixity = self.get_aip_fixity(sip_uuid, ss_api_key)
+        return self.download_file(url, aip_path,
+                                  auth=self.get_ss_api_auth(ss_api_key),
+                                  fixity=fixity,
+                                  segments=self.aip_download_segments)
 
-    def download_aip_pointer_file(self, sip_uuid, ss_api_key):
+    def download_aip_pointer_file(self, sip_uuid, ss_api_key,
+                                  pointer_file_name=None):
         """Use the AM SS API to download the completed AIP's pointer file.
-        Calls http://localhost:8000/api/v2/file/<SIP-UUID>/pointer_file/\
-                  ?username=<SS-USERNAME>&api_key=<SS-API-KEY>
+        Calls http://localhost:8000/api/v2/file/<SIP-UUID>/pointer_file/
+        The file is saved as ``pointer_file_name`` (by default,
+        ``pointer.<SIP-UUID>.xml``) in the temporary directory.
         """
-        payload = {'username': self.ss_username, 'api_key': ss_api_key}
         url = '{}api/v2/file/{}/pointer_file/'.format(self.ss_url, sip_uuid)
-        pointer_file_name = 'pointer.{}.xml'.format(sip_uuid)
+        pointer_file_name = (
+            pointer_file_name or 'pointer.{}.xml'.format(sip_uuid))
         pointer_file_path = os.path.join(self.tmp_path, pointer_file_name)
-        max_attempts = self.max_download_aip_attempts
+        return self.download_file(url, pointer_file_path,
+                                  auth=self.get_ss_api_auth(ss_api_key))
+
+    def get_aip_fixity(self, sip_uuid, ss_api_key):
+        """Return the ``(algorithm, digest)`` fixity of the AIP of SIP
+        ``sip_uuid`` as recorded in its pointer file, or ``None`` if it cannot
+        be verified because it is uncompressed (and has no pointer file) or
+        encrypted (its pointer file records the checksum of the encrypted
+        package, not of the download). Otherwise the AIP must have a pointer
+        file with a usable fixity, else ``ArchivematicaAPIAbilityError`` is
+        raised. The pointer file is saved apart from the one that the pointer
+        file steps download, and deleted once parsed.
+        """
+        package = self.get_ss_package(sip_uuid, ss_api_key=ss_api_key)
+        current_path = (package or {}).get('current_path') or ''
+        if package and not current_path.endswith(
+                c.COMPRESSED_PACKAGE_EXTENSIONS):
+            logger.warning('AIP %s is uncompressed, so it has no pointer file;'
+                           ' its download will not be verified', sip_uuid)
+            return None
+        pointer_file_path = None
+        try:
+            pointer_file_path = self.download_aip_pointer_file(
+                sip_uuid, ss_api_key,
+                pointer_file_name='fixity-pointer.{}.xml'.format(sip_uuid))
+            pointer_file = etree.parse(pointer_file_path)
+        except (ArchivematicaAPIAbilityError, etree.XMLSyntaxError) as exc:
+            raise ArchivematicaAPIAbilityError(
+                'Unable to read the pointer file of AIP {}, so its download'
+                ' cannot be verified: {}'.format(sip_uuid, exc))
+        finally:
+            if pointer_file_path and os.path.isfile(pointer_file_path):
+                os.unlink(pointer_file_path)
+        if pointer_file_is_encrypted(pointer_file):
+            logger.warning('AIP %s is encrypted, so its download will not be'
+                           ' verified', sip_uuid)
+            return None
+        fixity = parse_pointer_file_fixity(pointer_file)
+        if not fixity:
+            raise ArchivematicaAPIAbilityError(
+                'The pointer file of AIP {} records no usable fixity, so its'
+                ' download cannot be verified'.format(sip_uuid))
+        return fixity
+
+    def download_file(self, url, file_path, auth=None, fixity=None,
+                      segments=1):
+        """Download ``url`` to ``file_path`` in large chunks and return
+        ``file_path``. Interrupted downloads are resumed with HTTP Range
+        requests instead of starting over. If ``fixity`` is an ``(algorithm,
+        digest)`` pair, the digest of the download is computed as it arrives
+        and must match. With ``segments`` > 1, large files are fetched as that
+        many byte ranges in parallel, if the server supports range requests.
+        """
+        part_path = '{}.part'.format(file_path)
+        if os.path.isfile(part_path):
+            os.unlink(part_path)
+        size = None
+        if segments > 1:
+            size = self.get_range_download_size(url, auth)
+        if size and size >= segments * c.MIN_DOWNLOAD_SEGMENT_SIZE:
+            logger.info('Downloading %s bytes from %s in %s segments', size,
+                        url, segments)
+            self.download_segments(url, auth, part_path, size, segments)
+            hasher = hash_file(part_path, fixity)
+        else:
+            hasher = self.download_range(url, auth, part_path, fixity=fixity)
+        if hasher and hasher.hexdigest() != fixity[1].strip().lower():
+            os.unlink(part_path)
+            raise ArchivematicaAPIAbilityError(
+                'The {} checksum of the file downloaded from {} is {}; expected'
+                ' {}'.format(fixity[0], url, hasher.hexdigest(), fixity[1]))
+        os.replace(part_path, file_path)
+        return file_path
+
+    def get_range_download_size(self, url, auth=None):
+        """Return the size of the file at ``url`` if its server supports range
+        requests, else ``None``.
+        """
+        try:
+            r = self.http_client.get(url, auth=auth,
+                                     headers={'Range': 'bytes=0-0'},
+                                     stream=True)
+        except requests.exceptions.RequestException:
+            return None
+        with r:
+            match = re.match(r'bytes 0-0/(\d+)$',
+                             r.headers.get('Content-Range', ''))
+            if r.status_code != 206 or not match:
+                return None
+            return int(match.group(1))
+
+    def download_segments(self, url, auth, part_path, size, segments):
+        """Download the ``size`` bytes at ``url`` into ``part_path`` as
+        ``segments`` byte ranges in parallel.
+        """
+        with open(part_path, 'wb') as fileo:
+            fileo.truncate(size)
+        segment_size = -(-size // segments)
+        with ThreadPoolExecutor(max_workers=segments) as executor:
+            futures = [
+                executor.submit(self.download_range, url, auth, part_path,
+                                start, min(start + segment_size, size) - 1)
+                for start in range(0, size, segment_size)]
+            for future in futures:
+                future.result()
+
+    def download_range(self, url, auth, part_path, start=0, end=None,
+                       fixity=None):
+        """Download bytes ``start`` to ``end`` (inclusive; by default, to the
+        end of the file) of ``url`` into the same positions of ``part_path``.
+        After an interruption or a 404/500 response, retry (with capped
+        exponential backoff) from the first missing byte. Return the hasher
+        of the bytes downloaded if ``fixity`` is given.
+        """
+        hasher = get_hasher(fixity)
+        offset = start
         attempt = 0
+        delays = utils.backoff_delays(self.optimistic_wait,
+                                      self.pessimistic_wait)
         while True:
-            r = requests.get(url, params=payload, stream=True)
-            if r.ok:
-                _save_download(r, pointer_file_path)
-                return pointer_file_path
-            elif r.status_code in (404, 500) and attempt < max_attempts:
-                logger.warning(
-                    'Trying again to download AIP %s pointer file via GET'
-                    ' request to URL %s; SS returned status code %s and message'
-                    ' %s', sip_uuid, url, r.status_code, r.text)
-                attempt += 1
-                time.sleep(self.optimistic_wait)
-            else:
-                logger.warning('Unable to download AIP %s pointer file via GET'
-                               ' request to URL %s; SS returned status code %s'
-                               ' and message %s', sip_uuid, url, r.status_code,
-                               r.text)
+            headers = {}
+            if offset or end is not None:
+                headers['Range'] = 'bytes={}-{}'.format(
+                    offset, '' if end is None else end)
+            retriable = True
+            try:
+                r = self.http_client.get(url, auth=auth, headers=headers,
+                                         stream=True)
+                with r:
+                    if r.status_code == 206:
+                        range_start = get_content_range_start(r)
+                        if range_start != offset:
+                            raise ArchivematicaAPIAbilityError(
+                                'The server of {} returned bytes from {}'
+                                ' instead of from {}'.format(
+                                    url, range_start, offset))
+                    elif r.ok and (offset or end is not None):
+                        if end is not None:
+                            raise ArchivematicaAPIAbilityError(
+                                'The server of {} ignored our range'
+                                ' request'.format(url))
+                        logger.info('The server of %s ignored our range'
+                                    ' request; starting over', url)
+                        offset = 0
+                        hasher = get_hasher(fixity)
+                    if r.ok:
+                        mode = 'r+b' if os.path.isfile(part_path) else 'wb'
+                        with open(part_path, mode) as fileo:
+                            fileo.seek(offset)
+                            if end is None:
+                                fileo.truncate()
+                            for chunk in r.iter_content(
+                                    chunk_size=c.AIP_DOWNLOAD_CHUNK_SIZE):
+                                fileo.write(chunk)
+                                offset += len(chunk)
+                                if hasher:
+                                    hasher.update(chunk)
+                        if end is None or offset > end:
+                            return hasher
+                        error = 'the response ended at byte {}'.format(offset)
+                    else:
+                        error = ('SS returned status code {} and message'
+                                 ' {}'.format(r.status_code, r.text))
+                        retriable = r.status_code in (404, 500)
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.ChunkedEncodingError,
+                    requests.exceptions.Timeout) as exc:
+                error = str(exc)
+            if not retriable or attempt >= self.max_download_aip_attempts:
+                logger.warning('Unable to download %s; %s', url, error)
                 raise ArchivematicaAPIAbilityError(
-                    'Unable to download AIP {} pointer file'.format(sip_uuid))
+                    'Unable to download {}; {}'.format(url, error))
+            attempt += 1
+            logger.warning('Trying again to download %s from byte %s; %s', url,
+                           offset, error)
+            time.sleep(next(delays))
 
     def poll_until_aip_stored(self, sip_uuid, ss_api_key, poll_interval=1,
                               max_polls=None):
+        """Poll the SS API every ``poll_interval`` seconds, at most
+        ``max_polls`` times, until it knows the AIP of SIP ``sip_uuid``. Unlike
+        ``await_aip_stored``, this does not wait for the AIP to be uploaded.
+        """
         max_polls = max_polls or self.max_check_aip_stored_attempts
-        payload = {'username': self.ss_username, 'api_key': ss_api_key}
-        url = '{}api/v2/file/{}/'.format(self.ss_url, sip_uuid)
+        url = self.get_ss_api_file_url(sip_uuid)
+        auth = self.get_ss_api_auth(ss_api_key)
         counter = 0
         while True:
             counter += 1
             if counter > max_polls:
                 raise ArchivematicaAPIAbilityError(
-                    'Polled too many times waiting for AIP %s to be stored',
-                    sip_uuid)
-            r = requests.get(url, params=payload)
+                    'Polled too many times waiting for AIP {} to be'
+                    ' stored'.format(sip_uuid))
+            r = self.http_client.get(url, auth=auth)
             if r.ok:
                 break
             time.sleep(poll_interval)
 
+    def count_transfer_backlog_entries(
+            self, query, field=c.BACKLOG_SEARCH_FIELD_SIP_UUID,
+            query_type=c.BACKLOG_SEARCH_TYPE_PHRASE):
+        """Return the number of transfer backlog entries that match ``query``
+        in ``field``, according to the dashboard's backlog search JSON (which
+        is what the Backlog tab's table is populated from). Return ``None`` if
+        the search does not yield a usable response.
+        """
+        r = self.am_http_get(
+            self.get_transfer_backlog_search_url(),
+            params={'query': query, 'field': field, 'type': query_type,
+                    'sEcho': 1, 'iDisplayStart': 0, 'iDisplayLength': 10})
+        if not r.ok:
+            logger.info('Got status code %s when searching the transfer'
+                        ' backlog', r.status_code)
+            return None
+        try:
+            return int(r.json()['iTotalDisplayRecords'])
+        except (ValueError, KeyError, TypeError):
+            logger.info('Unable to parse the transfer backlog search results')
+            return None
+
+    def await_dip_in_transfer_backlog(self, dip_uuid, timeout=None):
+        """Poll the dashboard's backlog search JSON, with capped exponential
+        backoff, until the DIP with UUID ``dip_uuid`` is indexed in the
+        transfer backlog. Return ``True`` once it is, ``False`` if that takes
+        longer than ``timeout`` seconds and ``None`` if the backlog cannot be
+        searched this way.
+        """
+        if timeout is None:
+            timeout = self.max_search_dip_backlog_attempts * self.optimistic_wait
+        start = time.time()
+        for delay in utils.backoff_delays(self.optimistic_wait,
+                                          self.pessimistic_wait):
+            count = self.count_transfer_backlog_entries(dip_uuid)
+            if count is None:
+                return None
+            if count:
+                logger.info('Found DIP %s in the transfer backlog after'
+                            ' waiting for %.1f seconds.', dip_uuid,
+                            time.time() - start)
+                return True
+            if time.time() + delay > start + timeout:
+                logger.warning('In waiting for DIP %s to appear in the'
+                               ' transfer backlog, we exceeded the maximum'
+                               ' wait period of %s seconds.', dip_uuid,
+                               timeout)
+                return False
+            time.sleep(delay)
+
+    def get_ss_package(self, package_uuid, ss_api_key=None):
+        """Return the SS's representation of the package (e.g., AIP) with UUID
+        ``package_uuid``, or ``None`` if the SS does not know it (yet). The
+        request is authenticated with ``ss_api_key`` if given, else with the
+        SS session.
+        """
+        url = self.get_ss_api_file_url(package_uuid)
+        if ss_api_key:
+            r = self.http_client.get(
+                url, auth=self.get_ss_api_auth(ss_api_key))
+        else:
+            r = self.ss_http_get(url)
+        if not r.ok:
+            return None
+        return r.json()
+
+    def await_aip_stored(self, aip_uuid, ss_api_key=None, initial_delay=None,
+                         timeout=None):
+        """Poll the SS's file resource of AIP ``aip_uuid``, with capped
+        exponential backoff, until its status is "UPLOADED", i.e., until the
+        AIP is stored. Raise ``ArchivematicaAPIAbilityError`` if that takes
+        longer than ``timeout`` seconds.
+        """
+        if initial_delay is None:
+            initial_delay = self.optimistic_wait
+        if timeout is None:
+            timeout = (self.max_search_aip_archival_storage_attempts *
+                       self.optimistic_wait)
+        deadline = time.time() + timeout
+        status = None
+        for delay in utils.backoff_delays(initial_delay,
+                                          self.pessimistic_wait):
+            package = self.get_ss_package(aip_uuid, ss_api_key=ss_api_key)
+            status = package and package.get('status')
+            if status == c.SS_PACKAGE_STATUS_STORED:
+                logger.info('AIP %s is stored', aip_uuid)
+                return package
+            if time.time() + delay > deadline:
+                raise ArchivematicaAPIAbilityError(
+                    'Timed out waiting for AIP {} to be stored; its status in'
+                    ' the SS is {}'.format(aip_uuid, status))
+            time.sleep(delay)
+
 
-def _save_download(request, file_path):
-    with open(file_path, 'wb') as f:
-        for block in request.iter_content(1024):
-            f.write(block)
+def find_unit(units, unit_uuid):
+    """Return the unit with UUID ``unit_uuid`` in ``units`` (from the
+    dashboard's status JSON), or ``None``.
+    """
+    for unit in units:
+        if unit.get('uuid') == unit_uuid:
+            return unit
+    return None
+
+
+def find_unit_job(unit, ms_name, group_name):
+    """Return the normalized job (see ``normalize_status_job``) representing
+    the execution of micro-service ``ms_name`` in group ``group_name`` in
+    ``unit`` (from the dashboard's status JSON), or ``None``.
+    """
+    jobs = find_unit_jobs(unit, ms_name, group_name)
+    return jobs[0] if jobs else None
+
+
+def find_unit_jobs(unit, ms_name, group_name):
+    """Return the list of all normalized jobs representing executions of
+    micro-service ``ms_name`` in group ``group_name`` in ``unit``, e.g., one
+    per (re-)ingest, in the order of the dashboard's status JSON.
+    """
+    if not unit:
+        return []
+    squashed_ms_name = utils.squash(ms_name)
+    squashed_group_name = utils.squash(group_name)
+    jobs = []
+    for job in unit.get('jobs', []):
+        job = normalize_status_job(job)
+        if utils.squash(job['name']) != squashed_ms_name:
+            continue
+        if (job['group_name'] and
+                utils.squash(job['group_name']) != squashed_group_name):
+            continue
+        jobs.append(job)
+    return jobs
+
+
+def get_latest_job(jobs):
+    """Return the most recently created of the normalized jobs ``jobs``.
+    The dashboard lists jobs newest first, so without timestamps the first
+    job wins.
+    """
+    return max(jobs, key=lambda job: job['timestamp'])
+
+
+def normalize_status_job(job):
+    """Return the job dict ``job`` from the dashboard's status JSON in a
+    version-independent format. AM 1.6 reports the current step as a label,
+    AM 1.7+ as an integer code with a separate label.
+    """
+    current_step = job.get('currentstep_label') or job.get('currentstep')
+    if isinstance(current_step, int):
+        current_step = c.JOB_STATUS_CODES2OUTPUTS.get(current_step, 'Unknown')
+    choices = job.get('choices') or {}
+    if isinstance(choices, dict):
+        choices = list(choices.items())
+    return {'uuid': job.get('uuid'),
+            'name': job.get('type', ''),
+            'group_name': job.get('microservicegroup', ''),
+            'current_step': current_step,
+            'choices': [tuple(choice) for choice in choices],
+            'timestamp': float(job.get('timestamp') or 0)}
+
+
+def parse_pointer_file_fixity(pointer_file):
+    """Return the ``(algorithm, digest)`` fixity of the AIP in the lxml pointer
+    file ``pointer_file``, with the algorithm as a ``hashlib`` name (e.g.,
+    "sha256"), or ``None``. PREMIS 2 and 3 pointer files are supported.
+    """
+    fixity_els = pointer_file.xpath(
+        '//*[local-name()="objectCharacteristics"]/*[local-name()="fixity"]')
+    if not fixity_els:
+        return None
+    algorithm = fixity_els[0].xpath(
+        'string(*[local-name()="messageDigestAlgorithm"])')
+    digest = fixity_els[0].xpath('string(*[local-name()="messageDigest"])')
+    algorithm = algorithm.strip().lower().replace('-', '')
+    if not digest.strip() or algorithm not in hashlib.algorithms_available:
+        return None
+    return algorithm, digest.strip()
+
+
+def pointer_file_is_encrypted(pointer_file):
+    """Return ``True`` if the lxml pointer file ``pointer_file`` says that
+    its AIP must be decrypted.
+    """
+    return bool(pointer_file.xpath(
+        '//*[local-name()="transformFile"]'
+        '[translate(@TRANSFORMTYPE, "DECRYPTION", "decryption")='
+        '"decryption"]'))
+
+
+def get_content_range_start(response):
+    """Return the first byte position in the ``Content-Range`` header of the
+    partial content response ``response``, or ``None`` if it has none.
+    """
+    match = re.match(r'bytes (\d+)-\d+/(\d+|\*)$',
+                     response.headers.get('Content-Range', '').strip())
+    return int(match.group(1)) if match else None
+
+
+def get_hasher(fixity):
+    if not fixity:
+        return None
+    return hashlib.new(fixity[0])
+
+
+def hash_file(file_path, fixity):
+    """Return the hasher of the contents of ``file_path`` if ``fixity`` is
+    given.
+    """
+    hasher = get_hasher(fixity)
+    if hasher:
+        with open(file_path, 'rb') as filei:
+            for chunk in iter(
+                    lambda: filei.read(c.AIP_DOWNLOAD_CHUNK_SIZE), b''):
+                hasher.update(chunk)
+    return hasher
@@ -24,6 +24,7 @@ from selenium.webdriver.support.ui import (
 
 from . import constants as c
 from . import base
+from . import indexes
 from . import am_browser_auth_ability as auth_abl
 from . import am_browser_transfer_ingest_ability as tra_ing_abl
 from . import am_browser_ss_ability as ss_abl
@@ -85,9 +86,22 @@ class ArchivematicaBrowserAbility(
 
     def wait_for_aip_in_archival_storage(self, aip_uuid):
         """Wait for the AIP with UUID ``aip_uuid`` to appear in the Archival
-        storage tab.
+        storage tab. With the 'api' AIP wait backend, wait for the SS to report
+        the AIP as stored instead and only search the Archival storage tab
+        (once) if ``aip_wait_gui_check`` is set.
+        """
+        if self.aip_wait_backend == 'api':
+            self.api.await_aip_stored(aip_uuid)
+            if self.aip_wait_gui_check:
+                self.search_aip_in_archival_storage(aip_uuid, max_attempts=0)
+            return
+        self.search_aip_in_archival_storage(
+            aip_uuid, self.max_search_aip_archival_storage_attempts)
+
+    def search_aip_in_archival_storage(self, aip_uuid, max_attempts):
+        """Search for the AIP with UUID ``aip_uuid`` in the Archival storage
+        tab, searching again up to ``max_attempts`` times until it is found.
         """
-        max_attempts = self.max_search_aip_archival_storage_attempts
         attempts = 0
         while True:
             self.navigate(self.get_archival_storage_url(), reload=True)
@@ -140,18 +154,15 @@ class ArchivematicaBrowserAbility(
         url = self.get_aip_in_archival_storage_url(aip_uuid)
         max_attempts = self.max_navigate_aip_archival_storage_attempts
         attempt = 0
-        s = requests.session()
-        s.headers.update(
-            {'User-Agent':
-             'Mozilla/5.0 (Windows NT 6.3; WOW64) AppleWebKit/537.36 (KHTML,'
-             ' like Gecko) Chrome/44.0.2403.157 Safari/537.36'})
-        for cookie in self.driver.get_cookies():
-            s.cookies.update({cookie['name']: cookie['value']})
+        headers = {
+            'User-Agent':
+            'Mozilla/5.0 (Windows NT 6.3; WOW64) AppleWebKit/537.36 (KHTML,'
+            ' like Gecko) Chrome/44.0.2403.157 Safari/537.36'}
         while True:
             if attempt > max_attempts:
                 raise ArchivematicaBrowserAbilityError(
                     'Unable to navigate to {}'.format(url))
-            r = s.get(url)
+            r = self.am_http_get(url, headers=headers)
             if r.status_code == requests.codes.ok:
                 logger.info('Requests got OK status code %s when requesting'
                             ' %s', r.status_code, url)
@@ -164,6 +175,8 @@ class ArchivematicaBrowserAbility(
         self.navigate(url, reload=True)
 
     def initiate_reingest(self, aip_uuid, reingest_type='metadata-only'):
+        # The re-ingested SIP must be looked up afresh.
+        self.api.forget_sip_uuid(aip_uuid)
         self.navigate_to_aip_in_archival_storage(aip_uuid)
         reingest_tab_selector = 'a[href="#tab-reingest"]'
         self.wait_for_presence(reingest_tab_selector,
@@ -200,7 +213,12 @@ class ArchivematicaBrowserAbility(
 
     def wait_for_dip_in_transfer_backlog(self, dip_uuid):
         """Wait for the DIP with UUID ``dip_uuid`` to appear in the Backlog tab.
+        With the 'api' AIP wait backend, poll the backlog search JSON instead of
+        the Backlog tab, falling back to the latter if the JSON is unusable.
         """
+        if (self.aip_wait_backend == 'api' and
+                self.api.await_dip_in_transfer_backlog(dip_uuid) is not None):
+            return
         max_seconds = self.max_search_dip_backlog_attempts
         seconds = 0
         while True:
@@ -522,17 +540,7 @@ class ArchivematicaBrowserAbility(
 
 
 def _get_decision_id_from_label(decision_label):
-    decision_id = c.PC_DECISION2ID.get(decision_label)
-    if decision_id is None:
-        for label, id_ in c.PC_DECISION2ID.items():
-            if label.lower().startswith(decision_label.lower()):
-                decision_id = id_
-                break
-    if decision_id is None:
-        for label, id_ in c.PC_DECISION2ID.items():
-            if decision_label.lower() in label.lower():
-                decision_id = id_
-                break
+    decision_id = indexes.get_decision_id(decision_label)
     if decision_id is None:
         raise ArchivematicaBrowserAbilityError(
             'Unable to determine a decision id given input'
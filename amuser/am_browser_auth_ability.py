@@ -19,8 +19,14 @@ class ArchivematicaBrowserAuthenticationAbility(
     use a browser to login/out to/from Archivematica and/or the Storage Service.
     """
 
-    def login(self):
-        """Login to Archivematica."""
+    def login(self, use_stored_session=True):
+        """Login to Archivematica. If there is a stored dashboard session, it is
+        injected into the driver instead of submitting the login form.
+        """
+        if use_stored_session and self.session_store.inject_into_driver(
+                self.driver, self.am_url, self.am_username,
+                self.get_login_url(), self.http_client):
+            return
         self.driver.get(self.get_login_url())
         username_input_id = 'id_username'
         password_input_id = 'id_password'
@@ -38,9 +44,19 @@ class ArchivematicaBrowserAuthenticationAbility(
         submit_button_elem = self.driver.find_element_by_tag_name('button')
         submit_button_elem.click()
         # submit_button_elem.send_keys(Keys.RETURN)
+        if self.wait_for_login(self.get_login_url()):
+            self.session_store.capture_from_driver(
+                self.driver, self.am_url, self.am_username)
 
-    def login_ss(self):
-        """Login to Archivematica Storage Service."""
+    def login_ss(self, use_stored_session=True):
+        """Login to Archivematica Storage Service. If there is a stored SS
+        session, it is injected into the driver instead of submitting the login
+        form.
+        """
+        if use_stored_session and self.session_store.inject_into_driver(
+                self.driver, self.ss_url, self.ss_username,
+                self.get_ss_login_url(), self.http_client):
+            return
         self.driver.get(self.get_ss_login_url())
         username_input_id = 'id_username'
         password_input_id = 'id_password'
@@ -58,3 +74,19 @@ class ArchivematicaBrowserAuthenticationAbility(
         submit_button_elem = self.driver.find_element_by_css_selector(
             'input[type=submit]')
         submit_button_elem.click()
+        if self.wait_for_login(self.get_ss_login_url()):
+            self.session_store.capture_from_driver(
+                self.driver, self.ss_url, self.ss_username)
+
+    def wait_for_login(self, login_url):
+        """Wait for the browser to be redirected away from ``login_url`` after
+        the login form has been submitted. Return ``True`` on success.
+        """
+        try:
+            WebDriverWait(self.driver, self.pessimistic_wait).until(
+                lambda driver: not driver.current_url.startswith(login_url))
+        except TimeoutException:
+            logger.warning('Timed out when waiting for login to %s to'
+                           ' complete', login_url)
+            return False
+        return True
@@ -30,8 +30,11 @@ class ArchivematicaBrowserFileExplorerAbility(
 
     def add_transfer_directory(self, path):
         """Navigate to the transfer directory at ``path`` and click its "Add"
-        link.
+        link. The path is first validated against the SS's listings of the
+        transfer sources (using the SS session, so no API key is needed) so
+        that we fail immediately if it does not exist.
         """
+        self.api.validate_transfer_source_path(path)
         # Click the "Browse" button, if necessary.
         if not self.driver.find_element_by_css_selector(
                 c.SELECTOR_DIV_TRANSFER_SOURCE_BROWSE).is_displayed():
@@ -87,8 +90,9 @@ class ArchivematicaBrowserFileExplorerAbility(
             # Now the XPath matches folder ONLY if it's in the directory it
             # should be, i.e., this is now an absolute XPath.
             folder_label_xpath = c.XPATH_TREEITEM_NEXT_SIBLING.join(xtrail)
-            # Wait until folder is visible.
-            block = WebDriverWait(self.driver, 3)
+            # Wait until folder is visible. We know that the path exists so
+            # the folder must appear once its parent's contents have loaded.
+            block = WebDriverWait(self.driver, self.pessimistic_wait)
             block.until(EC.presence_of_element_located(
                 (By.XPATH, folder_label_xpath)))
             if is_last:
@@ -96,16 +100,28 @@ class ArchivematicaBrowserFileExplorerAbility(
                 # Click target (leaf) folder and then "Add" button.
                 folder_el = self.driver.find_element_by_xpath(folder_label_xpath)
                 self.click_folder_label(folder_el)
-                time.sleep(self.pessimistic_wait)
+                block = WebDriverWait(self.driver, self.pessimistic_wait)
+                block.until(EC.element_to_be_clickable(
+                    (By.CSS_SELECTOR, c.SELECTOR_BUTTON_ADD_DIR_TO_TRANSFER)))
                 self.click_add_button()
                 self.driver.execute_script('window.scrollTo(0, 0);')
                 logger.info('Clicked to select folder "%s"', folder)
+            elif self.folder_is_expanded(folder_label_xpath):
+                logger.info('Folder "%s" is already open', folder)
             else:
                 # Click ancestor folder's icon to open its contents.
                 logger.info('Clicking to open folder "%s"', folder)
                 self.click_folder(folder_label_xpath)
                 logger.info('Clicked to open folder "%s"', folder)
 
+    def folder_is_expanded(self, folder_label_xpath):
+        """Return ``True`` if the contents of the folder matching
+        ``folder_label_xpath`` are already visible in the file explorer.
+        """
+        return any(
+            el.is_displayed() for el in self.driver.find_elements_by_xpath(
+                folder_label2children_xpath(folder_label_xpath)))
+
     def click_add_folder(self, folder_id):
         """Click the "Add" link in the old AM file explorer interface, i.e., to
         add a directory to a transfer.
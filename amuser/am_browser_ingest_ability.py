@@ -3,7 +3,7 @@
 import logging
 import time
 
-from lxml import etree
+from lxml import etree, html
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
@@ -24,6 +24,11 @@ class ArchivematicaBrowserMETSAbilityError(
     pass
 
 
+class ArchivematicaBrowserIngestAbilityError(
+        base.ArchivematicaUserError):
+    pass
+
+
 logger = logging.getLogger('amuser.ingest')
 
 
@@ -37,11 +42,7 @@ class ArchivematicaBrowserIngestAbility(
 
     def remove_all_ingests(self):
         """Remove all ingests in the Ingest tab."""
-        url = self.get_ingest_url()
-        self.driver.get(url)
-        if self.driver.current_url != url:
-            self.login()
-        self.driver.get(url)
+        self.navigate(self.get_ingest_url(), reload=True)
         self.wait_for_presence(c.SELECTOR_TRANSFER_DIV, 20)
         while True:
             top_transfer_elem = self.get_top_transfer()
@@ -50,16 +51,12 @@ class ArchivematicaBrowserIngestAbility(
             self.remove_top_transfer(top_transfer_elem)
 
     def get_sip_uuid(self, transfer_name):
+        """Return the UUID of the SIP created from the transfer named
+        ``transfer_name``. This is resolved via the dashboard's ingest status
+        JSON (and memoized by the API ability), so the browser is not touched.
+        """
         logger.info('Getting SIP UUID from transfer name %s', transfer_name)
-        self.driver.quit()
-        self.driver = self.get_driver()
-        ingest_url = self.get_ingest_url()
-        self.driver.get(ingest_url)
-        if self.driver.current_url != ingest_url:
-            self.login()
-        self.driver.get(ingest_url)
-        sip_uuid, _, _ = (
-            self.wait_for_transfer_to_appear(transfer_name))
+        sip_uuid = self.api.get_sip_uuid(transfer_name)
         logger.info('Got SIP UUID %s', sip_uuid)
         return sip_uuid
 
@@ -72,11 +69,27 @@ class ArchivematicaBrowserIngestAbility(
         """
         if not sip_uuid:
             sip_uuid = self.get_sip_uuid(transfer_name)
-        ingest_url = self.get_ingest_url()
-        self.navigate(ingest_url)
         # Wait for the "Store AIP" micro-service.
         ms_name = utils.normalize_ms_name('Store AIP (review)', self.vn)
-        self.expose_job(ms_name, sip_uuid, 'ingest')
+        if self.job_wait_backend == 'api':
+            self.api.await_job(ms_name, sip_uuid, 'ingest')
+        else:
+            self.navigate(self.get_ingest_url())
+            self.expose_job(ms_name, sip_uuid, 'ingest')
+        mets = self.api.download_mets(
+            transfer_name, sip_uuid, parse_xml=parse_xml)
+        if mets is not None:
+            return mets
+        logger.info('Falling back to getting the METS file of SIP %s via the'
+                    ' AIP preview', sip_uuid)
+        return self.get_mets_via_aip_preview(transfer_name, sip_uuid,
+                                             parse_xml=parse_xml)
+
+    def get_mets_via_aip_preview(self, transfer_name, sip_uuid,
+                                 parse_xml=True):
+        """Get the METS file by clicking on it in the AIP preview and scraping
+        the page source of the window that opens.
+        """
         aip_preview_url = '{}/ingest/preview/aip/{}'.format(
             self.am_url, sip_uuid)
         self.navigate(aip_preview_url)
@@ -169,34 +182,43 @@ class ArchivematicaBrowserIngestAbility(
                 'input[value=Save]').click()
 
     def parse_normalization_report(self, sip_uuid):
-        """Wait for the "Approve normalization" job to appear and then open the
-        normalization report, parse it and return a list of dicts.
+        """Wait for the "Approve normalization" job to appear and then fetch
+        the normalization report, parse it and return a list of dicts.
         """
-        report = []
-        self.driver.quit()
-        self.driver = self.get_driver()
-        url = self.get_ingest_url()
-        self.driver.get(url)
-        if self.driver.current_url != url:
-            self.login()
-        self.driver.get(url)
-        ms_name = utils.normalize_ms_name('Approve normalization (review)', self.vn)
-        self.expose_job(ms_name, sip_uuid, 'sip')
-        nrmlztn_rprt_url = self.get_normalization_report_url(sip_uuid)
-        self.driver.get(nrmlztn_rprt_url)
-        if self.driver.current_url != nrmlztn_rprt_url:
-            self.login()
-        self.driver.get(nrmlztn_rprt_url)
-        self.wait_for_presence('table')
-        table_el = self.driver.find_element_by_css_selector('table')
-        keys = [td_el.text.strip().lower().replace(' ', '_')
-                for td_el in table_el
-                .find_element_by_css_selector('thead tr')
-                .find_elements_by_css_selector('th')]
-        for tr_el in table_el.find_elements_by_css_selector('tbody tr'):
-            row = {}
-            for index, td_el in enumerate(
-                    tr_el.find_elements_by_css_selector('td')):
-                row[keys[index]] = td_el.text
-            report.append(row)
-        return report
+        columns = self.get_normalization_report_columns(sip_uuid)
+        rows = zip(*columns.values())
+        return [{key: val for key, val in zip(columns, row) if val is not None}
+                for row in rows]
+
+    def get_normalization_report_columns(self, sip_uuid):
+        """Wait for the "Approve normalization" job to appear and then fetch
+        the normalization report over HTTP and return its table as a dict
+        mapping each column name (e.g., "file_format") to the list of the
+        column's values, one per file. Cells missing from short rows are
+        ``None``.
+        """
+        ms_name = utils.normalize_ms_name(
+            'Approve normalization (review)', self.vn)
+        if self.job_wait_backend == 'api':
+            self.api.await_job(ms_name, sip_uuid, 'ingest')
+        else:
+            self.navigate(self.get_ingest_url())
+            self.expose_job(ms_name, sip_uuid, 'sip')
+        url = self.get_normalization_report_url(sip_uuid)
+        r = self.am_http_get(url)
+        if not r.ok:
+            raise ArchivematicaBrowserIngestAbilityError(
+                'Got status code {} when requesting the normalization report'
+                ' at {}'.format(r.status_code, url))
+        table = html.fromstring(r.content).xpath('//table')
+        if not table:
+            raise ArchivematicaBrowserIngestAbilityError(
+                'There is no table in the normalization report at {}'.format(
+                    url))
+        keys = [utils.get_html_text(th).lower().replace(' ', '_')
+                for th in table[0].xpath('(.//tr[th])[1]/th')]
+        rows = [[utils.get_html_text(td) for td in tr.xpath('./td')]
+                for tr in table[0].xpath('.//tr[td]')]
+        return {key: [row[index] if index < len(row) else None
+                      for row in rows]
+                for index, key in enumerate(keys)}
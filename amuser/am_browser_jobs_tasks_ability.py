@@ -1,10 +1,18 @@
 """Archivematica Browser Jobs & Tasks Ability"""
 
+from concurrent.futures import ThreadPoolExecutor
+import json
 import logging
+import os
+import re
+import tempfile
 import time
+from urllib.parse import urljoin
 
+import lxml.html
 from selenium.common.exceptions import NoSuchElementException
 
+from . import base
 from . import constants as c
 from . import utils
 from . import selenium_ability
@@ -13,25 +21,23 @@ from . import selenium_ability
 logger = logging.getLogger('amuser.jobstasks')
 
 
+class ArchivematicaBrowserJobsTasksAbilityError(base.ArchivematicaUserError):
+    pass
+
+
 class ArchivematicaBrowserJobsTasksAbility(
         selenium_ability.ArchivematicaSeleniumAbility):
     """Archivematica Browser Jobs & Tasks Ability."""
 
-    @selenium_ability.recurse_on_stale
     def get_job_output(self, ms_name, transfer_uuid):
         """Get the output---"Completed successfully", "Failed"---of the Job
         model representing the execution of micro-service ``ms_name`` in
         transfer ``transfer_uuid``.
         """
         ms_name, group_name = utils.micro_service2group(ms_name)
-        ms_group_elem = self.get_transfer_micro_service_group_elem(
-            group_name, transfer_uuid)
-        for job_elem in ms_group_elem.find_elements_by_css_selector('div.job'):
-            for span_elem in job_elem.find_elements_by_css_selector(
-                    'div.job-detail-microservice span'):
-                if span_elem.text.strip() == ms_name:
-                    return job_elem.find_element_by_css_selector(
-                        'div.job-detail-currentstep span').text.strip()
+        job = self.get_snapshot_job(ms_name, group_name, transfer_uuid)
+        if job:
+            return job['current_step']
         return None
 
     def expose_job(self, ms_name, transfer_uuid, unit_type='transfer'):
@@ -65,8 +71,9 @@ class ArchivematicaBrowserJobsTasksAbility(
     def parse_job(self, ms_name, transfer_uuid, unit_type='transfer'):
         """Parse the job representing the execution of the micro-service named
         ``ms_name`` on the transfer with UUID ``transfer_uuid``. Return a dict
-        containing the ``job_output`` (e.g., "Failed") and the parsed tasks
-        <table> as a dict with the following format::
+        containing the ``job_output`` (e.g., "Failed"), the ``ms_name`` and
+        ``unit_uuid`` it was parsed for and the parsed tasks <table> as a dict
+        with the following format::
             >>> {
                     '<task_uuid>': {
                         'task_uuid': '...',
@@ -82,6 +89,24 @@ class ArchivematicaBrowserJobsTasksAbility(
                     '<task_uuid>': { ... }
                 }
         """
+        job_uuid, job_output = self.get_terminal_job(
+            ms_name, transfer_uuid, unit_type)
+        # Open the tasks in a new browser window with a new
+        # Selenium driver; then parse the table there.
+        table_dict = {'job_output': job_output, 'tasks': {}}
+        tasks_url = self.get_tasks_url(job_uuid)
+        table_dict = self.parse_tasks_table(tasks_url, table_dict)
+        table_dict['ms_name'] = ms_name
+        table_dict['unit_uuid'] = transfer_uuid
+        return table_dict
+
+    def get_terminal_job(self, ms_name, transfer_uuid, unit_type='transfer'):
+        """Wait for the job representing the execution of the micro-service
+        named ``ms_name`` on the unit with UUID ``transfer_uuid`` to terminate
+        and return its UUID and output.
+        """
+        if self.job_wait_backend == 'api':
+            return self.api.await_job(ms_name, transfer_uuid, unit_type)
         ms_name, group_name = self.expose_job(ms_name, transfer_uuid, unit_type)
         # If we don't wait for a second here, then sometimes the tasks page
         # returns incorrect data because (assumedly) the tasks haven't been
@@ -92,21 +117,171 @@ class ArchivematicaBrowserJobsTasksAbility(
         # exit codes sometimes show up.
         time.sleep(self.optimistic_wait)
         # Getting the Job UUID also means waiting for the job to terminate.
-        job_uuid, job_output = self.get_job_uuid(ms_name, group_name,
-                                                 transfer_uuid)
-        # Open the tasks in a new browser window with a new
-        # Selenium driver; then parse the table there.
-        table_dict = {'job_output': job_output, 'tasks': {}}
-        tasks_url = self.get_tasks_url(job_uuid)
-        table_dict = self.parse_tasks_table(tasks_url, table_dict)
-        return table_dict
+        return self.get_job_uuid(ms_name, group_name, transfer_uuid)
+
+    def iter_job_tasks(self, ms_name, unit_uuid, unit_type='transfer',
+                       with_output=False):
+        """Like ``parse_job`` but, instead of returning a dict of all tasks,
+        yield the tasks one at a time. The yielded task dicts have the same
+        keys as in ``parse_job``'s ``table_dict``, minus ``stdout`` and
+        ``stderr`` unless ``with_output`` is ``True``.
+        """
+        job_uuid, job_output = self.get_terminal_job(
+            ms_name, unit_uuid, unit_type)
+        yield from self.iter_tasks(
+            self.get_tasks_url(job_uuid), with_output=with_output,
+            job_output=job_output)
+
+    def iter_tasks(self, tasks_url, with_output=False, job_output=None):
+        """Yield the tasks at ``tasks_url`` and subsequent pages; see
+        ``iter_job_tasks``. If the tasks are cached (see ``parse_tasks_table``)
+        they are served from the cache. Otherwise, whatever the
+        ``tasks_parser`` setting, one page of tasks is fetched over HTTP and
+        parsed with lxml at a time, so callers that stop iterating early
+        (e.g., at the first failed assertion) never fetch the remaining pages.
+        The tasks of a job whose output ``job_output`` is terminal are written
+        to the cache as they stream past; the cache file only replaces its
+        predecessor once a full pass has finished.
+        """
+        cached_tasks = self.get_cached_tasks(tasks_url)
+        if cached_tasks is not None:
+            for task in cached_tasks.values():
+                yield strip_task_output(task, with_output)
+            return
+        parse_page = {'1.6': parse_tasks_page_am_1_6,
+                      '1.7': parse_tasks_page_am_1_7}.get(
+                          self.vn, parse_tasks_page_am_1_6)
+        cache_path = None
+        if job_output in c.JOB_OUTPUTS_TERMINAL:
+            cache_path = self.get_tasks_cache_path(tasks_url)
+        fileo = tmp_path = None
+        if cache_path:
+            cache_dir = os.path.dirname(cache_path)
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+            fileo = os.fdopen(fd, 'w')
+            fileo.write('{')
+        settled = True
+        count = 0
+        try:
+            first_url = tasks_url
+            while tasks_url:
+                page = self.get_tasks_page(tasks_url)
+                tasks = parse_page(page, {'tasks': {}})['tasks']
+                tasks_url = get_next_tasks_url(page, tasks_url, self.vn)
+                del page
+                for task_uuid, task in tasks.items():
+                    count += 1
+                    if fileo:
+                        settled = settled and self.tasks_are_settled(
+                            {task_uuid: task})
+                        fileo.write('{}{}: {}'.format(
+                            ', ' if count > 1 else '', json.dumps(task_uuid),
+                            json.dumps(task)))
+                    yield strip_task_output(task, with_output)
+            if fileo:
+                fileo.write('}')
+                fileo.close()
+                fileo = None
+                if count and settled:
+                    os.replace(tmp_path, cache_path)
+                    tmp_path = None
+                else:
+                    logger.info('Not caching the tasks of %s since some of'
+                                ' them have no exit code yet', first_url)
+        finally:
+            if fileo:
+                fileo.close()
+            if tmp_path:
+                os.unlink(tmp_path)
 
     def parse_tasks_table(self, tasks_url, table_dict):
-        old_driver = self.driver
-        table_dict = self._parse_tasks_table(tasks_url, table_dict, self.vn)
-        self.driver = old_driver
+        """Parse the tasks at ``tasks_url`` into ``table_dict``. The
+        ``tasks_parser`` setting determines whether this is done by scraping
+        the page in a browser (``'browser'``) or by fetching its HTML with an
+        authenticated Requests session and parsing it with lxml (``'http'``).
+        Both engines return the same ``table_dict``.
+
+        The tasks of jobs whose output (``table_dict['job_output']``) is
+        terminal are cached on disk, so that parsing them again does not
+        require fetching the tasks pages (waiting for the job still does). A
+        snapshot is only cached once all of its tasks have exit codes, since
+        the tasks page can show an exit code of 'None' right after a job
+        finishes.
+        """
+        cacheable = table_dict.get('job_output') in c.JOB_OUTPUTS_TERMINAL
+        if cacheable:
+            cached_tasks = self.get_cached_tasks(tasks_url)
+            if cached_tasks is not None:
+                table_dict['tasks'].update(cached_tasks)
+                return table_dict
+        if self.tasks_parser == 'http':
+            table_dict = self._parse_tasks_table_http(
+                tasks_url, table_dict, self.vn)
+        else:
+            old_driver = self.driver
+            table_dict = self._parse_tasks_table(tasks_url, table_dict, self.vn)
+            self.driver = old_driver
+        if cacheable:
+            self.cache_tasks(tasks_url, table_dict['tasks'])
         return table_dict
 
+    @staticmethod
+    def tasks_are_settled(tasks):
+        """Return ``True`` if every task in the tasks dict ``tasks`` has an
+        exit code, i.e., if the snapshot can be cached.
+        """
+        return bool(tasks) and all(
+            task.get('exit_code') not in (None, '', 'None')
+            for task in tasks.values())
+
+    def get_tasks_cache_path(self, tasks_url):
+        """Return the path of the file caching the tasks of the job at
+        ``tasks_url``, or ``None`` if the job UUID cannot be read from it.
+        """
+        match = re.search(r'/tasks/([0-9a-fA-F-]{36})/', tasks_url)
+        if not match:
+            return None
+        return os.path.join(
+            self.permanent_path, c.TASKS_CACHE_DIR_NAME,
+            '{}.json'.format(match.group(1).lower()))
+
+    def get_cached_tasks(self, tasks_url):
+        """Return the cached tasks dict of the job at ``tasks_url``, or
+        ``None`` if it has not been cached.
+        """
+        cache_path = self.get_tasks_cache_path(tasks_url)
+        if not cache_path or not os.path.isfile(cache_path):
+            return None
+        try:
+            with open(cache_path) as filei:
+                tasks = json.load(filei)
+        except ValueError:
+            logger.warning('Ignoring corrupt tasks cache file %s', cache_path)
+            return None
+        logger.info('Using cached tasks of %s from %s', tasks_url, cache_path)
+        return tasks
+
+    def cache_tasks(self, tasks_url, tasks):
+        """Cache the tasks dict ``tasks`` of the (terminated) job at
+        ``tasks_url``, unless some of its tasks lack exit codes.
+        """
+        cache_path = self.get_tasks_cache_path(tasks_url)
+        if not cache_path:
+            return
+        if not self.tasks_are_settled(tasks):
+            logger.info('Not caching the tasks of %s since some of them have'
+                        ' no exit code yet', tasks_url)
+            return
+        cache_dir = os.path.dirname(cache_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temporary file and rename it so that concurrent readers
+        # never see a partially written cache file.
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w') as fileo:
+            json.dump(tasks, fileo)
+        os.replace(tmp_path, cache_path)
+
     def _parse_tasks_table(self, tasks_url, table_dict, vn):
         return {'1.6': self._parse_tasks_table_am_1_6,
                 '1.7': self._parse_tasks_table_am_1_7}.get(
@@ -115,9 +290,7 @@ class ArchivematicaBrowserJobsTasksAbility(
 
     def _parse_tasks_table_am_1_6(self, tasks_url, table_dict):
         self.driver = self.get_driver()
-        if self.driver.current_url != tasks_url:
-            self.login()
-        self.driver.get(tasks_url)
+        self.navigate(tasks_url)
         self.wait_for_presence('table')
         # Parse the <table> to a dict and return it.
         table_elem = self.driver.find_element_by_tag_name('table')
@@ -140,7 +313,7 @@ class ArchivematicaBrowserJobsTasksAbility(
             if link_button.text.strip() == 'Next Page':
                 next_tasks_url = '{}{}'.format(
                     self.am_url, link_button.get_attribute('href'))
-        self.driver.quit()
+        self.release_driver(self.driver)
         if next_tasks_url:
             table_dict = self._parse_tasks_table_am_1_6(
                 next_tasks_url, table_dict)
@@ -153,9 +326,7 @@ class ArchivematicaBrowserJobsTasksAbility(
         anyway.
         """
         self.driver = self.get_driver()
-        if self.driver.current_url != tasks_url:
-            self.login()
-        self.driver.get(tasks_url)
+        self.navigate(tasks_url)
         self.wait_for_presence('article.task')
         for task_art_elem in self.driver.find_elements_by_css_selector(
                 'article.task'):
@@ -191,38 +362,94 @@ class ArchivematicaBrowserJobsTasksAbility(
             if link_button.text.strip() == 'Next page':
                 next_tasks_url = '{}{}'.format(
                     self.am_url, link_button.get_attribute('href'))
-        self.driver.quit()
+        self.release_driver(self.driver)
         if next_tasks_url:
             table_dict = self._parse_tasks_table_am_1_7(
                 next_tasks_url, table_dict)
         return table_dict
 
-    @selenium_ability.recurse_on_stale
+    def _parse_tasks_table_http(self, tasks_url, table_dict, vn):
+        """Parse all pages of tasks, starting at ``tasks_url``. If the first
+        page tells us how many pages there are, the remaining pages are
+        fetched and parsed concurrently, at most ``max_tasks_page_fetchers``
+        at a time, and merged into ``table_dict`` in page order. Otherwise we
+        follow the "Next page" links one page at a time.
+        """
+        parse_page = {'1.6': parse_tasks_page_am_1_6,
+                      '1.7': parse_tasks_page_am_1_7}.get(
+                          vn, parse_tasks_page_am_1_6)
+        page = self.get_tasks_page(tasks_url)
+        parse_page(page, table_dict)
+        next_tasks_url = get_next_tasks_url(page, tasks_url, vn)
+        page_urls = get_tasks_page_urls(page, next_tasks_url)
+        if page_urls:
+            logger.info('Fetching %s more pages of tasks concurrently',
+                        len(page_urls))
+
+            def fetch_and_parse(page_url):
+                page = self.get_tasks_page(page_url)
+                return (parse_page(page, {'tasks': {}})['tasks'],
+                        get_next_tasks_url(page, page_url, vn))
+
+            workers = max(1, min(self.max_tasks_page_fetchers,
+                                 len(page_urls)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for tasks, next_tasks_url in executor.map(
+                        fetch_and_parse, page_urls):
+                    table_dict['tasks'].update(tasks)
+        # If the page count was unknown (or tasks were added since we read
+        # it) follow the "Next page" links serially.
+        while next_tasks_url:
+            page = self.get_tasks_page(next_tasks_url)
+            parse_page(page, table_dict)
+            next_tasks_url = get_next_tasks_url(page, next_tasks_url, vn)
+        return table_dict
+
+    def get_tasks_page(self, tasks_url):
+        """Fetch the tasks page at ``tasks_url`` and return it as an lxml HTML
+        element.
+        """
+        r = self.am_http_get(tasks_url)
+        if not r.ok:
+            raise ArchivematicaBrowserJobsTasksAbilityError(
+                'Got status code {} when requesting tasks page {}'.format(
+                    r.status_code, tasks_url))
+        return lxml.html.fromstring(r.content)
+
     def get_job_uuid(self, ms_name, group_name, transfer_uuid,
                      job_outputs=c.JOB_OUTPUTS_COMPLETE):
         """Get the UUID of the Job model representing the execution of
-        micro-service ``ms_name`` in transfer ``transfer_uuid``.
+        micro-service ``ms_name`` in transfer ``transfer_uuid``. Wait until the
+        job's output is one of ``job_outputs`` and return it too.
         """
-        ms_group_elem = self.get_transfer_micro_service_group_elem(
-            group_name, transfer_uuid)
-        for job_elem in ms_group_elem.find_elements_by_css_selector('div.job'):
-            for span_elem in job_elem.find_elements_by_css_selector(
-                    'div.job-detail-microservice span'):
-                if utils.squash(span_elem.text) == utils.squash(ms_name):
-                    job_output = job_elem.find_element_by_css_selector(
-                        'div.job-detail-currentstep span').text.strip()
-                    if job_output in job_outputs:
-                        return (span_elem.get_attribute('title').strip(),
-                                job_output)
-                    time.sleep(self.quick_wait)
-                    return self.get_job_uuid(ms_name, group_name, transfer_uuid)
-        return None, None
+        while True:
+            job = self.get_snapshot_job(ms_name, group_name, transfer_uuid)
+            if not job:
+                return None, None
+            if job['current_step'] in job_outputs:
+                return job['uuid'], job['current_step']
+            time.sleep(self.quick_wait)
+
+
+def strip_task_output(task, with_output):
+    """Return a copy of the task dict ``task``, without its ``stdout`` and
+    ``stderr`` unless ``with_output`` is ``True``.
+    """
+    task = dict(task)
+    if not with_output:
+        task.pop('stdout', None)
+        task.pop('stderr', None)
+    return task
 
 
 def process_task_header_row(row_elem, row_dict):
     """Parse the text in the first tasks <tr>, the one "File UUID:"."""
-    for line in row_elem.find_element_by_tag_name('td').text\
-            .strip().split('\n'):
+    return parse_task_header_text(
+        row_elem.find_element_by_tag_name('td').text, row_dict)
+
+
+def parse_task_header_text(text, row_dict):
+    for line in text.strip().split('\n'):
         line = line.strip()
         if line.startswith('('):
             line = line[1:]
@@ -237,8 +464,12 @@ def process_task_command_row(row_elem, row_dict):
     """Parse the text in the second tasks <tr>, the one specifying command
     and arguments.
     """
-    command_text = \
-        row_elem.find_element_by_tag_name('td').text.strip().split(':')[1]
+    return parse_task_command_text(
+        row_elem.find_element_by_tag_name('td').text, row_dict)
+
+
+def parse_task_command_text(text, row_dict):
+    command_text = text.strip().split(':')[1]
     command, *arguments = command_text.split()
     row_dict['command'] = command
     arguments = ' '.join(arguments)
@@ -280,3 +511,152 @@ def get_tasks_row_type(row_elem):
     except NoSuchElementException:
         pass
     return 'command'
+
+
+# Parsing tasks pages fetched over HTTP. The functions below take lxml HTML
+# elements and mirror the Selenium-based parsing above; they must produce
+# exactly the same ``table_dict``.
+
+
+def has_class(class_name):
+    """Return an XPath predicate matching elements with CSS class
+    ``class_name``, i.e., the equivalent of the CSS selector
+    ``.class_name``.
+    """
+    return 'contains(concat(" ", normalize-space(@class), " "), " {} ")'.format(
+        class_name)
+
+
+def get_first_html_text(elem, xpath, preformatted=False, default=None):
+    """Return the text of the first element matching ``xpath`` in ``elem``,
+    or ``default`` if there is none.
+    """
+    matches = elem.xpath(xpath)
+    if not matches:
+        return default
+    return utils.get_html_text(matches[0], preformatted=preformatted)
+
+
+def get_html_tasks_row_type(row_elem):
+    """Like ``get_tasks_row_type`` but for an lxml <tr> element."""
+    if row_elem.get('class', '').strip():
+        return 'header'
+    if row_elem.xpath('.//td[{}]'.format(has_class('stdout'))):
+        return 'stdout'
+    if row_elem.xpath('.//td[{}]'.format(has_class('stderror'))):
+        return 'stderr'
+    return 'command'
+
+
+def parse_tasks_page_am_1_6(page, table_dict):
+    """Parse the tasks <table> in lxml HTML element ``page`` into
+    ``table_dict``.
+    """
+    row_dict = {}
+    for row_elem in page.xpath('(//table)[1]//tr'):
+        row_type = get_html_tasks_row_type(row_elem)
+        if row_type == 'header':
+            if row_dict:
+                table_dict['tasks'][row_dict['task_uuid']] = row_dict
+            row_dict = parse_task_header_text(
+                get_first_html_text(row_elem, './/td'), {})
+        elif row_type == 'command':
+            row_dict = parse_task_command_text(
+                get_first_html_text(row_elem, './/td'), row_dict)
+        else:
+            row_dict[row_type] = get_first_html_text(
+                row_elem, './/pre', preformatted=True)
+    if row_dict:
+        table_dict['tasks'][row_dict['task_uuid']] = row_dict
+    return table_dict
+
+
+def parse_tasks_page_am_1_7(page, table_dict):
+    """Parse the task <article> elements in lxml HTML element ``page`` into
+    ``table_dict``.
+    """
+    for task_art_elem in page.xpath('//article[{}]'.format(has_class('task'))):
+        row_dict = {}
+        row_dict['stdout'] = get_first_html_text(
+            task_art_elem, './/*[{}]//pre'.format(has_class('panel-default')),
+            preformatted=True, default='')
+        row_dict['stderr'] = get_first_html_text(
+            task_art_elem, './/*[{}]//pre'.format(has_class('panel-danger')),
+            preformatted=True, default='')
+        row_dict['command'] = get_first_html_text(
+            task_art_elem, './/h3[{} and {}]'.format(
+                has_class('panel-title'), has_class('panel-title-simple')))
+        arguments = get_first_html_text(
+            task_art_elem, './/div[{}]//div[{}]//pre'.format(
+                has_class('panel-primary'), has_class('shell-output')),
+            preformatted=True)
+        row_dict['arguments'] = utils.parse_task_arguments_to_list(arguments)
+        for dl_el in task_art_elem.xpath(
+                './/div[{}]//dl'.format(has_class('row'))):
+            for el in dl_el.iterdescendants():
+                if not isinstance(el.tag, str):
+                    continue
+                if el.tag == 'dt':
+                    attr = utils.get_html_text(el).lower().replace(' ', '_')
+                else:
+                    row_dict[attr] = utils.get_html_text(el)
+        row_dict['task_uuid'] = get_first_html_text(
+            task_art_elem, './/div[{}]//h4'.format(
+                has_class('task-heading'))).split()[1]
+        table_dict['tasks'][row_dict['task_uuid']] = row_dict
+    return table_dict
+
+
+def get_tasks_page_count(page):
+    """Return the number of pages of tasks according to the pagination of
+    lxml HTML element ``page``, or ``None`` if it does not say. We look for a
+    "Page X of Y" text in the pagination, i.e., in the elements that hold the
+    ``page=N`` links or have a "pagination" class, and, failing that, for the
+    highest ``page=N`` that is linked to. The rest of the page is ignored
+    since the output of tasks can contain anything.
+    """
+    page_links = page.xpath(
+        '//a[contains(@href, "page=")][not(ancestor::pre)]')
+    containers = page.xpath('//*[{}][not(ancestor::pre)]'.format(
+        has_class('pagination')))
+    containers += [link.getparent() for link in page_links
+                   if link.getparent() is not None]
+    for container in containers:
+        match = re.search(r'Page\s+\d+\s+of\s+(\d+)',
+                          container.text_content())
+        if match:
+            return int(match.group(1))
+    page_numbers = [int(number) for link in page_links
+                    for number in re.findall(r'[?&]page=(\d+)',
+                                             link.get('href'))]
+    if page_numbers:
+        return max(page_numbers)
+    return None
+
+
+def get_tasks_page_urls(page, next_tasks_url):
+    """Return the URLs of all pages of tasks after lxml HTML element
+    ``page``, given that ``next_tasks_url`` is the URL of the next one.
+    Return ``None`` if that cannot be determined.
+    """
+    if not next_tasks_url:
+        return []
+    match = re.search(r'[?&]page=(\d+)', next_tasks_url)
+    page_count = get_tasks_page_count(page)
+    if not match or page_count is None:
+        return None
+    return ['{}{}{}'.format(next_tasks_url[:match.start(1)], number,
+                            next_tasks_url[match.end(1):])
+            for number in range(int(match.group(1)), page_count + 1)]
+
+
+def get_next_tasks_url(page, tasks_url, vn):
+    """Return the absolute URL of the next page of tasks linked to from lxml
+    HTML element ``page`` (fetched from ``tasks_url``), or ``None``.
+    """
+    next_text = {'1.6': 'Next Page', '1.7': 'Next page'}.get(vn, 'Next Page')
+    next_tasks_url = None
+    for link_button in page.xpath('//a[{}]'.format(has_class('btn'))):
+        if utils.get_html_text(link_button) == next_text and link_button.get('href'):
+            next_tasks_url = urljoin(tasks_url, link_button.get('href'))
+    return next_tasks_url
@@ -17,14 +17,31 @@ from . import selenium_ability
 logger = logging.getLogger('amuser.transfer')
 
 
+# JavaScript that returns the name, UUID and <div> element of every unit
+# (transfer or SIP) in the Transfer or Ingest tab, in a single WebDriver round
+# trip. AM hides the UUID in the name <div>'s <abbr> when the window is wide
+# and shows it in its own <div> when it is narrow, so we check both.
+JS_UNIT_SUMMARIES = '''
+var units = [];
+var sipEls = document.querySelectorAll('div.sip');
+for (var i = 0; i < sipEls.length; i++) {
+    var nameEl = sipEls[i].querySelector('div.sip-detail-directory');
+    if (!nameEl) { continue; }
+    var name = nameEl.innerText.trim().replace(/\\s*UUID$/, '');
+    var abbrEl = nameEl.querySelector('abbr');
+    var uuidEl = sipEls[i].querySelector('div.sip-detail-uuid');
+    var uuid = (abbrEl && abbrEl.getAttribute('title') || '').trim();
+    if (!uuid && uuidEl) { uuid = uuidEl.innerText.trim(); }
+    units.push({name: name, uuid: uuid, elem: sipEls[i]});
+}
+return units;
+'''
+
+
 class ArchivematicaBrowserTransferAbility(
         selenium_ability.ArchivematicaSeleniumAbility):
     """Archivematica Browser Transfer Tab Ability."""
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self.check_transfer_appeared_attempts = 0
-
     def start_transfer(self, transfer_path, transfer_name, accession_no=None,
                        transfer_type=None):
         """Start a new transfer with name ``transfer_name``, transfering the
@@ -118,57 +135,52 @@ class ArchivematicaBrowserTransferAbility(
 
     def wait_for_transfer_to_appear(self, transfer_name, name_is_prefix=False):
         """Wait until the transfer appears in the transfer tab (after "Start
-        transfer" has been clicked). The only way to do this seems to be to
-        check each row for our unique ``transfer_name`` and do
-        ``time.sleep(self.micro_wait)`` until it appears, or a max number of waits is
-        exceeded.
-        Returns the transfer UUID and the transfer <div> element.
+        transfer" has been clicked) or the SIP appears in the ingest tab. We
+        look for our unique ``transfer_name`` among the units in the page
+        using a single script per poll, until it appears or
+        ``max_check_transfer_appeared_attempts`` polls' worth of time has
+        passed.
+        Returns the transfer UUID, the transfer <div> element and the
+        transfer name (which is different from ``transfer_name`` if
+        ``name_is_prefix`` is ``True``), or ``(None, None, None)``.
         """
-        transfer_name_div_selector = 'div.sip-detail-directory'
-        transfer_uuid_div_selector = 'div.sip-detail-uuid'
-        self.wait_for_presence(transfer_name_div_selector)
-        transfer_uuid = correct_transfer_div_elem = None
-        for transfer_div_elem in self.driver\
-                .find_elements_by_css_selector(c.SELECTOR_TRANSFER_DIV):
-            transfer_name_div_elem = transfer_div_elem\
-                .find_element_by_css_selector(transfer_name_div_selector)
-            transfer_uuid_div_elem = transfer_div_elem\
-                .find_element_by_css_selector(transfer_uuid_div_selector)
-            # Identify the transfer by its name. The complication here is that
-            # AM detects a narrow browser window and hides the UUID in the
-            # narrow case. So depending on the visibility/width of things, we
-            # find the UUID in different places.
-            transfer_name_in_dom = transfer_name_div_elem.text.strip()
-            if transfer_name_in_dom.endswith('UUID'):
-                transfer_name_in_dom = transfer_name_in_dom[:-4].strip()
-            if name_is_prefix:
-                cond = transfer_name_in_dom.startswith(transfer_name)
-            else:
-                cond = transfer_name_in_dom == transfer_name
-            if cond:
-                logger.info('Changed transfer name from %s to %s',
-                            transfer_name, transfer_name_in_dom)
-                transfer_name = transfer_name_in_dom
-                abbr_elem = transfer_name_div_elem.find_element_by_tag_name(
-                    'abbr')
-                if abbr_elem and abbr_elem.is_displayed():
-                    transfer_uuid = abbr_elem.get_attribute('title').strip()
-                else:
-                    transfer_uuid = transfer_uuid_div_elem.text.strip()
-                correct_transfer_div_elem = transfer_div_elem
-        if not transfer_uuid:
-            self.check_transfer_appeared_attempts += 1
-            if (self.check_transfer_appeared_attempts <
-                    self.max_check_transfer_appeared_attempts):
-                time.sleep(self.quick_wait)
-                transfer_uuid, correct_transfer_div_elem, transfer_name = (
-                    self.wait_for_transfer_to_appear(
-                        transfer_name, name_is_prefix=name_is_prefix))
-            else:
-                self.check_transfer_appeared_attempts = 0
+        self.wait_for_presence('div.sip-detail-directory')
+        unit_type = 'transfer'
+        if self.driver.current_url.startswith(self.get_ingest_url()):
+            unit_type = 'ingest'
+        deadline = time.time() + (
+            self.max_check_transfer_appeared_attempts * self.quick_wait)
+        while True:
+            unit = self.find_unit_in_page(transfer_name, name_is_prefix)
+            if unit:
+                break
+            if time.time() > deadline:
+                logger.warning('Timed out waiting for %s %s to appear',
+                               unit_type, transfer_name)
                 return None, None, None
+            time.sleep(self.quick_wait)
+        if unit['name'] != transfer_name:
+            logger.info('Changed transfer name from %s to %s',
+                        transfer_name, unit['name'])
         time.sleep(self.quick_wait)
-        return transfer_uuid, correct_transfer_div_elem, transfer_name
+        return unit['uuid'], unit['elem'], unit['name']
+
+    def find_unit_in_page(self, unit_name, name_is_prefix=False):
+        """Return the summary (see ``JS_UNIT_SUMMARIES``) of the unit named
+        ``unit_name`` (or, if ``name_is_prefix``, the last unit whose name
+        starts with ``unit_name``) in the current Transfer or Ingest tab, or
+        ``None``.
+        """
+        match = None
+        for unit in self.driver.execute_script(JS_UNIT_SUMMARIES):
+            if not unit['uuid']:
+                continue
+            if name_is_prefix:
+                if unit['name'].startswith(unit_name):
+                    match = unit
+            elif unit['name'] == unit_name:
+                match = unit
+        return match
 
     def click_start_transfer_button(self):
         start_transfer_button_elem = self.driver.find_element_by_css_selector(
@@ -177,11 +189,7 @@ class ArchivematicaBrowserTransferAbility(
 
     def navigate_to_transfer_tab(self):
         """Navigate to Archivematica's Transfer tab and make sure it worked."""
-        url = self.get_transfer_url()
-        self.driver.get(url)
-        if self.driver.current_url != url:
-            self.login()
-        self.driver.get(url)
+        self.navigate(self.get_transfer_url(), reload=True)
         transfer_name_input_id = 'transfer-name'
         self.wait_for_presence('#{}'.format(transfer_name_input_id))
         assert "Archivematica Dashboard - Transfer" in self.driver.title
@@ -4,7 +4,6 @@ import logging
 import time
 
 from selenium.webdriver.support.ui import Select
-from selenium.common.exceptions import NoSuchElementException
 
 from . import utils
 from . import base
@@ -18,6 +17,91 @@ from . import am_browser_ingest_ability as ingest_abl
 logger = logging.getLogger('amuser.transferingest')
 
 
+# JavaScript that summarizes all of the units (transfers or SIPs) in the
+# Transfer or Ingest tab, their micro-service groups and their jobs, in a
+# single WebDriver round trip.
+JS_UNITS_SNAPSHOT = '''
+var groupNamePrefix = /^Micro-?service:\\s*/;
+var units = {};
+var sipEls = document.querySelectorAll('div.sip');
+for (var i = 0; i < sipEls.length; i++) {
+    var rowEl = sipEls[i].querySelector('[id^="sip-row-"]');
+    if (!rowEl) { continue; }
+    var nameEl = sipEls[i].querySelector('div.sip-detail-directory');
+    var groups = {};
+    var groupEls = sipEls[i].querySelectorAll('div.microservicegroup');
+    for (var j = 0; j < groupEls.length; j++) {
+        var groupNameEl = groupEls[j].querySelector(
+            'span.microservice-group-name');
+        if (!groupNameEl) { continue; }
+        var groupName = groupNameEl.textContent.trim().replace(
+            groupNamePrefix, '');
+        var jobs = groups[groupName] || [];
+        var jobEls = groupEls[j].querySelectorAll('div.job');
+        for (var k = 0; k < jobEls.length; k++) {
+            var msEl = jobEls[k].querySelector(
+                'div.job-detail-microservice span');
+            if (!msEl) { continue; }
+            var stepEl = jobEls[k].querySelector(
+                'div.job-detail-currentstep span');
+            var selectEl = jobEls[k].querySelector(
+                'div.job-detail-actions select');
+            var choices = [];
+            if (selectEl) {
+                for (var m = 0; m < selectEl.options.length; m++) {
+                    choices.push(selectEl.options[m].textContent.trim());
+                }
+            }
+            jobs.push({
+                name: msEl.textContent.trim(),
+                uuid: (msEl.getAttribute('title') || '').trim(),
+                current_step: stepEl ? stepEl.textContent.trim() : null,
+                has_decision: selectEl !== null,
+                choices: choices,
+                visible: msEl.getClientRects().length > 0
+            });
+        }
+        groups[groupName] = jobs;
+    }
+    units[rowEl.id.substring('sip-row-'.length)] = {
+        name: nameEl ? nameEl.textContent.trim() : null,
+        groups: groups
+    };
+}
+return units;
+'''
+
+# JavaScript that returns the <div> of the micro-service group named
+# ``arguments[1]`` of the unit with UUID ``arguments[0]``.
+JS_GET_MS_GROUP_ELEM = '''
+var rowEl = document.getElementById('sip-row-' + arguments[0]);
+if (!rowEl) { return null; }
+var sipEl = rowEl.closest('div.sip');
+if (!sipEl) { return null; }
+var groupEls = sipEl.querySelectorAll('div.microservicegroup');
+for (var i = 0; i < groupEls.length; i++) {
+    var nameEl = groupEls[i].querySelector('span.microservice-group-name');
+    if (nameEl && nameEl.textContent.trim() === arguments[1]) {
+        return groupEls[i];
+    }
+}
+return null;
+'''
+
+# JavaScript that returns the decision <select> of the job with UUID
+# ``arguments[0]``.
+JS_GET_JOB_SELECT_ELEM = '''
+var msEls = document.querySelectorAll('div.job-detail-microservice span');
+for (var i = 0; i < msEls.length; i++) {
+    if ((msEls[i].getAttribute('title') || '').trim() === arguments[0]) {
+        var jobEl = msEls[i].closest('div.job');
+        return jobEl && jobEl.querySelector('div.job-detail-actions select');
+    }
+}
+return null;
+'''
+
+
 class ArchivematicaBrowserTransferIngestAbilityError(
         base.ArchivematicaUserError):
     pass
@@ -35,6 +119,8 @@ class ArchivematicaBrowserTransferIngestAbility(
         """Wait for the job representing the execution of micro-service
         ``ms_name`` on the unit with UUID ``transfer_uuid`` to complete.
         """
+        if self.job_wait_backend == 'api':
+            return self.api.await_job(ms_name, transfer_uuid, unit_type)
         ms_name, group_name = self.expose_job(ms_name, transfer_uuid, unit_type)
         job_uuid, job_output = self.get_job_uuid(
             ms_name, group_name, transfer_uuid)
@@ -48,6 +134,9 @@ class ArchivematicaBrowserTransferIngestAbility(
         ms_name = utils.normalize_ms_name(ms_name, self.vn)
         logger.info('Await decision point "%s" with unit %s of type %s',
                     ms_name, transfer_uuid, unit_type)
+        if self.job_wait_backend == 'api':
+            return self.api.await_job(ms_name, transfer_uuid, unit_type,
+                                      job_outputs=('Awaiting decision',))
         ms_name, group_name = self.expose_job(ms_name, transfer_uuid, unit_type)
         job_uuid, job_output = self.get_job_uuid(
             ms_name, group_name, transfer_uuid,
@@ -63,38 +152,24 @@ class ArchivematicaBrowserTransferIngestAbility(
         decision_point = utils.normalize_ms_name(decision_point, self.vn)
         decision_point, group_name = self.expose_job(
             decision_point, uuid_val, unit_type=unit_type)
-        ms_group_elem = self.get_transfer_micro_service_group_elem(
-            group_name, uuid_val)
-        action_div_el = None
-        for job_elem in ms_group_elem.find_elements_by_css_selector('div.job'):
-            for span_elem in job_elem.find_elements_by_css_selector(
-                    'div.job-detail-microservice span'):
-                if utils.squash(span_elem.text) == utils.squash(decision_point):
-                    action_div_el = job_elem.find_element_by_css_selector(
-                        'div.job-detail-actions')
-                    break
-            if action_div_el:
-                break
-        if action_div_el:
-            try:
-                select_el = action_div_el.find_element_by_css_selector('select')
-            except NoSuchElementException:
-                time.sleep(self.quick_wait)
-                return self.make_choice(choice_text, decision_point, uuid_val,
-                                        unit_type=unit_type)
-            index = None
-            for i, option_el in enumerate(
-                    select_el.find_elements_by_tag_name('option')):
-                if utils.squash(choice_text) in utils.squash(option_el.text):
-                    index = i
-            if index is not None:
-                Select(select_el).select_by_index(index)
-            else:
+        while True:
+            job = self.get_snapshot_job(decision_point, group_name, uuid_val)
+            if not job:
                 raise ArchivematicaBrowserTransferIngestAbilityError(
-                    'Unable to select choice "{}"'.format(choice_text))
-        else:
+                    'Unable to find decision point {}'.format(decision_point))
+            if job['has_decision']:
+                break
+            time.sleep(self.quick_wait)
+        index = None
+        for i, option_text in enumerate(job['choices']):
+            if utils.squash(choice_text) in utils.squash(option_text):
+                index = i
+        if index is None:
             raise ArchivematicaBrowserTransferIngestAbilityError(
-                'Unable to find decision point {}'.format(decision_point))
+                'Unable to select choice "{}"'.format(choice_text))
+        select_el = self.driver.execute_script(
+            JS_GET_JOB_SELECT_ELEM, job['uuid'])
+        Select(select_el).select_by_index(index)
 
     def assert_no_option(self, choice_text, decision_point, uuid_val,
                          unit_type='transfer'):
@@ -114,22 +189,16 @@ class ArchivematicaBrowserTransferIngestAbility(
                 ' though we expected this not to be possible.'.format(
                     choice_text, decision_point))
 
-    @selenium_ability.recurse_on_stale
     def wait_for_microservice_visibility(self, ms_name, group_name,
                                          transfer_uuid):
         """Wait until micro-service ``ms_name`` of transfer ``transfer_uuid``
         is visible.
         """
-        ms_group_elem = self.get_transfer_micro_service_group_elem(
-            group_name, transfer_uuid)
-        for job_elem in ms_group_elem.find_elements_by_css_selector('div.job'):
-            for span_elem in job_elem.find_elements_by_css_selector(
-                    'div.job-detail-microservice span'):
-                if utils.squash(span_elem.text) == utils.squash(ms_name):
-                    return
-        time.sleep(self.micro_wait)
-        self.wait_for_microservice_visibility(ms_name, group_name,
-                                              transfer_uuid)
+        while True:
+            job = self.get_snapshot_job(ms_name, group_name, transfer_uuid)
+            if job and job['visible']:
+                return
+            time.sleep(self.micro_wait)
 
     @selenium_ability.recurse_on_stale
     def click_show_tasks_button(self, ms_name, group_name, transfer_uuid):
@@ -162,41 +231,65 @@ class ArchivematicaBrowserTransferIngestAbility(
                     ' visible.'.format(max_attempts, group_name, transfer_uuid))
                 logger.warning(msg)
                 raise ArchivematicaBrowserTransferIngestAbilityError(msg)
-            ms_group_elem = self.get_transfer_micro_service_group_elem(
-                group_name, transfer_uuid)
-            if ms_group_elem:
+            unit = self.get_units_snapshot().get(transfer_uuid)
+            if unit and group_name in unit['groups']:
                 return
             time.sleep(self.quick_wait)
             attempts += 1
 
-    @selenium_ability.recurse_on_stale
     def get_transfer_micro_service_group_elem(self, group_name, transfer_uuid):
         """Get the DOM element (<div>) representing the micro-service group
         with name ``group_name`` of the transfer with UUID ``transfer_uuid``.
         """
-        transfer_div_elem = None
-        transfer_dom_id = 'sip-row-{}'.format(transfer_uuid)
-        for elem in self.driver.find_elements_by_css_selector('div.sip'):
-            try:
-                elem.find_element_by_id(transfer_dom_id)
-                transfer_div_elem = elem
-            except NoSuchElementException:
-                pass
-        if not transfer_div_elem:
-            logger.warning('Unable to find Transfer %s.', transfer_uuid)
-            return None
         if self.vn == '1.6':
             expected_name = 'Micro-service: {}'.format(group_name)
         else:
             expected_name = 'Microservice: {}'.format(group_name)
-        result = None
-        for ms_group_elem in transfer_div_elem.find_elements_by_css_selector(
-                'div.microservicegroup'):
-            name_elem_text = ms_group_elem.find_element_by_css_selector(
-                'span.microservice-group-name').text.strip()
-            if name_elem_text == expected_name:
-                logger.info('DOM name "%s" MATCHES expected name "%s"',
-                            name_elem_text, expected_name)
-                result = ms_group_elem
-                break
+        result = self.driver.execute_script(
+            JS_GET_MS_GROUP_ELEM, transfer_uuid, expected_name)
+        if not result:
+            logger.warning('Unable to find micro-service group %s of'
+                           ' Transfer %s.', group_name, transfer_uuid)
         return result
+
+    def get_units_snapshot(self):
+        """Return a summary of all of the units (transfers or SIPs) in the
+        current Transfer or Ingest tab, obtained with a single JavaScript call.
+        The returned dict maps unit UUIDs to dicts of the form::
+
+            >>> {'name': '<unit name>',
+            ...  'groups': {
+            ...      '<micro-service group name>': [
+            ...          {'name': '<micro-service name>',
+            ...           'uuid': '<job UUID>',
+            ...           'current_step': 'Completed successfully',
+            ...           'has_decision': False,
+            ...           'choices': [],
+            ...           'visible': True},
+            ...          ...]}}
+        """
+        units = self.driver.execute_script(JS_UNITS_SNAPSHOT) or {}
+        for unit in units.values():
+            # The unit name <div> also contains an <abbr> with text "UUID".
+            name = unit['name'] or ''
+            if name.endswith('UUID'):
+                unit['name'] = name[:-4].strip()
+        return units
+
+    def get_snapshot_job(self, ms_name, group_name, transfer_uuid,
+                         snapshot=None):
+        """Return the snapshot dict (see ``get_units_snapshot``) of the job
+        representing the execution of micro-service ``ms_name`` in group
+        ``group_name`` of unit ``transfer_uuid``, or ``None``.
+        """
+        if snapshot is None:
+            snapshot = self.get_units_snapshot()
+        unit = snapshot.get(transfer_uuid)
+        if not unit:
+            logger.warning('Unable to find Transfer %s.', transfer_uuid)
+            return None
+        squashed_ms_name = utils.squash(ms_name)
+        for job in unit['groups'].get(group_name, []):
+            if utils.squash(job['name']) == squashed_ms_name:
+                return job
+        return None
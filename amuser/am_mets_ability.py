@@ -4,13 +4,25 @@ This module contains the ``ArchivematicaMETSAbility`` class, which represents an
 Archivematica user's ability to interact with METS XML files.
 """
 
+import copy
+import logging
 import os
+import threading
 
 from . import base
 from . import constants as c
 from . import utils
 
 
+logger = logging.getLogger('amuser.mets')
+
+
+# Parsed METS files, shared by all scenarios of a run. Keyed by dashboard URL
+# and SIP UUID; each value is a ``(freshness_token, mets)`` pair.
+_METS_CACHE = {}
+_METS_CACHE_LOCK = threading.Lock()
+
+
 class ArchivematicaMETSAbility(base.Base):
     """Represents an Archivematica user's ability to interact with METS XML
     files.
@@ -18,6 +30,39 @@ class ArchivematicaMETSAbility(base.Base):
 
     mets_nsmap = c.METS_NSMAP
 
+    def get_cached_mets(self, sip_uuid, token):
+        """Return the parsed METS file of SIP ``sip_uuid`` if it is cached
+        with freshness token ``token`` (e.g., the UUID of the "Store AIP" job
+        that the METS file was fetched for), else ``None``. The cached tree is
+        shared by all scenarios, so callers get a copy that they may modify.
+        """
+        if token is None:
+            return None
+        with _METS_CACHE_LOCK:
+            cached_token, mets = _METS_CACHE.get(
+                (self.am_url, sip_uuid), (None, None))
+        if cached_token == token:
+            logger.info('Using cached METS file of SIP %s', sip_uuid)
+            return copy.deepcopy(mets)
+        return None
+
+    def cache_mets(self, sip_uuid, token, mets):
+        """Cache a copy of the parsed METS file ``mets`` of SIP ``sip_uuid``
+        with freshness token ``token``, so that the caller may go on to
+        modify ``mets``.
+        """
+        if token is None:
+            return
+        with _METS_CACHE_LOCK:
+            _METS_CACHE[(self.am_url, sip_uuid)] = (token, copy.deepcopy(mets))
+
+    def forget_mets(self, sip_uuid):
+        """Drop the cached METS file of SIP ``sip_uuid``, e.g., because the
+        SIP is being re-ingested.
+        """
+        with _METS_CACHE_LOCK:
+            _METS_CACHE.pop((self.am_url, sip_uuid), None)
+
     @staticmethod
     def get_premis_events(mets):
         """Return all PREMIS events in ``mets`` (lxml.etree parse) as a list of
@@ -41,8 +86,7 @@ class ArchivematicaMETSAbility(base.Base):
             })
         return result
 
-    @staticmethod
-    def validate_mets_for_pids(mets_doc, accession_no=None):
+    def validate_mets_for_pids(self, mets_doc, accession_no=None):
         """Validate that the METS XML file represented by ``lxml.Element`` instance
         ``mets_doc`` has PIDs and PURLs for all files, directories and for the AIP
         itself. If ``accession_no`` is provided, assert that the PID for the AIP
@@ -72,7 +116,7 @@ class ArchivematicaMETSAbility(base.Base):
                         'Identifier {} is not a hdl'.format(idfr))
                 else:
                     purls.append(idfr)
-            assert utils.all_urls_resolve(purls), (
+            assert utils.all_urls_resolve(purls, self.http_client), (
                 'At least one PURL does not resolve in\n  {}'.format(
                     '\n  '.join(purls)))
 
@@ -4,6 +4,7 @@ This module contains the ``ArchivematicaUser`` class, which represents a user
 of Archivematica.
 """
 
+from concurrent.futures import Future, ThreadPoolExecutor
 import logging
 import os
 import shlex
@@ -16,6 +17,9 @@ from . import am_ssh_ability
 from . import am_mets_ability
 from . import base
 from . import constants as c
+from . import decision_responder
+from . import http_client
+from . import session_store
 
 
 logger = logging.getLogger('amuser')
@@ -30,18 +34,176 @@ class ArchivematicaUser(base.Base):
         - API abilities (via Requests) accessed through ``self.api``.
         - SSH abilities (via ssh, scp) accessed through ``self.ssh``.
         - METS (XML) abilities, accessed through ``self.mets``.
+
+    All abilities share one session store so that we log in to the dashboard
+    and the Storage Service only once, and one pooled HTTP client so that
+    connections to them are re-used.
     """
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.browser = am_browser_ability.ArchivematicaBrowserAbility(**kwargs)
+        session_store_path = None
+        if self.persist_sessions:
+            session_store_path = os.path.join(
+                self.permanent_path, c.SESSIONS_FILE_NAME)
+        kwargs['session_store'] = self.session_store = (
+            session_store.get_session_store(session_store_path))
+        kwargs['http_client'] = self.http_client = (
+            http_client.get_http_client(
+                max_connections_per_host=self.max_http_connections,
+                retries=self.http_retries))
+        self.ability_kwargs = kwargs
+        self.api = am_api_ability.ArchivematicaAPIAbility(**kwargs)
+        # The browser delegates waiting (e.g., for jobs) to the API ability
+        # when so configured.
+        self.browser = am_browser_ability.ArchivematicaBrowserAbility(
+            api=self.api, **kwargs)
         self.ssh = am_ssh_ability.ArchivematicaSSHAbility(
             **kwargs)
         self.docker = am_docker_ability.ArchivematicaDockerAbility(
             **kwargs)
-        self.api = am_api_ability.ArchivematicaAPIAbility(**kwargs)
         self.mets = am_mets_ability.ArchivematicaMETSAbility(**kwargs)
 
+    def start_transfer(self, transfer_path, transfer_name, accession_no=None,
+                       transfer_type=None):
+        """Start and approve a transfer using the Transfer tab or the
+        dashboard API, depending on ``transfer_start_backend``, and return
+        ``(transfer_uuid, transfer_name)``. Scenarios that test the Transfer
+        tab itself should call ``self.browser.start_transfer`` directly.
+        """
+        ability = self.browser
+        if self.transfer_start_backend == 'api':
+            ability = self.api
+        return ability.start_transfer(
+            transfer_path, transfer_name, accession_no=accession_no,
+            transfer_type=transfer_type)
+
+    def get_mets(self, transfer_name, sip_uuid=None):
+        """Return the parsed METS file of the SIP created from transfer
+        ``transfer_name``. Parsed METS files are cached per SIP and per
+        "Store AIP" job, so repeated assertions on the same METS file (even
+        across scenarios) fetch it only once.
+        """
+        if not sip_uuid:
+            sip_uuid = self.browser.get_sip_uuid(transfer_name)
+        mets = self.mets.get_cached_mets(
+            sip_uuid, self.api.get_store_aip_job_uuid(sip_uuid))
+        if mets is None:
+            mets = self.browser.get_mets(transfer_name, sip_uuid)
+            self.mets.cache_mets(
+                sip_uuid, self.api.get_store_aip_job_uuid(sip_uuid), mets)
+        return mets
+
+    def respond_to_decisions(self, decisions, unit_names, timeout=None):
+        """Start answering the decision points in ``decisions`` (a dict from
+        decision point name to choice text) of the transfers named
+        ``unit_names``, and of the SIPs created from them, through the
+        dashboard as soon as they appear. Return the started
+        ``DecisionResponder``; its ``wait`` method blocks until every decision
+        has been answered and returns a record of the answers.
+        """
+        if timeout is None:
+            timeout = self.max_check_for_ms_group_attempts * self.quick_wait
+        return decision_responder.DecisionResponder(
+            self.api, decisions, unit_names, timeout).start()
+
+    def start_transfers(self, specs, concurrency=1):
+        """Start and approve many transfers, at most ``concurrency`` at a
+        time, and return a list of futures, one per spec. Each spec is a dict
+        with a ``transfer_path`` and, optionally, a ``transfer_name`` (which
+        is made unique), an ``accession_no`` and a ``transfer_type``. Each
+        future resolves to a dict with the ``transfer_uuid``,
+        ``transfer_name`` and ``sip_uuid`` of the transfer, the latter once
+        the transfer has become a SIP. When starting transfers in the browser,
+        each concurrent start uses its own pooled browser (in addition to the
+        one this user already holds), so ``concurrency`` is capped at
+        ``max_drivers - 1``.
+
+        Archivematica names a zipped bag transfer after its zip file, ignoring
+        the ``transfer_name``, so the zipped bags in ``specs`` must have
+        distinct file names; otherwise we could not tell their SIPs apart.
+        """
+        zipped_bag_names = [
+            os.path.basename(spec['transfer_path'].rstrip('/'))
+            for spec in specs if spec.get('transfer_type') == 'Zipped bag']
+        if len(set(zipped_bag_names)) < len(zipped_bag_names):
+            raise base.ArchivematicaUserError(
+                'Unable to start zipped bag transfers with the same file name'
+                ' concurrently: {}'.format(', '.join(sorted(zipped_bag_names))))
+        if self.transfer_start_backend != 'api':
+            max_concurrency = max(1, self.max_drivers - 1)
+            if concurrency > max_concurrency:
+                logger.info('Starting at most %s transfers at a time because'
+                            ' only %s browsers may be open', max_concurrency,
+                            self.max_drivers)
+                concurrency = max_concurrency
+        executor = ThreadPoolExecutor(max_workers=max(1, concurrency))
+        start_futures = [executor.submit(self._start_transfer_spec, spec)
+                         for spec in specs]
+        executor.shutdown(wait=False)
+        return [self._then_watch_sip(start_future)
+                for start_future in start_futures]
+
+    def _start_transfer_spec(self, spec):
+        transfer_path = spec['transfer_path']
+        transfer_name = self.unique_name(
+            spec.get('transfer_name') or
+            os.path.basename(transfer_path.rstrip('/')).replace('-', '_'))
+        kwargs = {'accession_no': spec.get('accession_no'),
+                  'transfer_type': spec.get('transfer_type')}
+        # A zipped bag is named after its zip file, so its name may be that of
+        # a SIP from an earlier run; ignore the SIPs that exist already.
+        existing_sip_uuids = ()
+        if kwargs['transfer_type'] == 'Zipped bag':
+            existing_sip_uuids = [
+                unit['uuid'] for unit in self.api.get_unit_statuses('ingest')]
+        if self.transfer_start_backend == 'api':
+            transfer_uuid, transfer_name = self.api.start_transfer(
+                transfer_path, transfer_name, **kwargs)
+            return transfer_uuid, transfer_name, existing_sip_uuids
+        # ``self.browser`` has a single driver, which cannot be shared across
+        # threads.
+        browser = am_browser_ability.ArchivematicaBrowserAbility(
+            api=self.api, **self.ability_kwargs)
+        browser.set_up()
+        try:
+            transfer_uuid, transfer_name = browser.start_transfer(
+                transfer_path, transfer_name, **kwargs)
+        finally:
+            browser.release_driver(browser.driver)
+        return transfer_uuid, transfer_name, existing_sip_uuids
+
+    def _then_watch_sip(self, start_future):
+        """Return a future that resolves once the transfer started by
+        ``start_future`` has become a SIP.
+        """
+        result = Future()
+
+        def on_started(start_future):
+            try:
+                transfer_uuid, transfer_name, existing_sip_uuids = (
+                    start_future.result())
+            except Exception as exc:  # pylint: disable=broad-except
+                result.set_exception(exc)
+                return
+
+            def on_sip(sip_future):
+                try:
+                    sip_uuid = sip_future.result()
+                except Exception as exc:  # pylint: disable=broad-except
+                    result.set_exception(exc)
+                    return
+                result.set_result({'transfer_uuid': transfer_uuid,
+                                   'transfer_name': transfer_name,
+                                   'sip_uuid': sip_uuid})
+
+            self.api.watch_sip(
+                transfer_name, exclude_uuids=existing_sip_uuids,
+            ).add_done_callback(on_sip)
+
+        start_future.add_done_callback(on_started)
+        return result
+
     @staticmethod
     def decompress_package(package_path):
         if os.path.isdir(package_path):
@@ -1,9 +1,11 @@
 """Base class for ArchivematicaUser and other related classes."""
 # pylint: disable=too-many-instance-attributes
 
+import itertools
 import os
 import re
 import shutil
+import threading
 
 try:
     from urllib import parse
@@ -22,6 +24,11 @@ class ArchivematicaUserError(Exception):
 
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
+# Counter that makes the names returned by ``Base.unique_name`` unique even
+# when many are generated in the same second, e.g., by concurrent threads.
+_UNIQUE_NAME_COUNTER = itertools.count()
+_UNIQUE_NAME_LOCK = threading.Lock()
+
 
 class Base:
     """Base class for Archivematica user- and ability-type classes. Should only
@@ -39,6 +46,20 @@ class Base:
         ('ss_url', c.DEFAULT_SS_URL),
         ('ss_api_key', c.DEFAULT_SS_API_KEY),
         ('driver_name', c.DEFAULT_DRIVER_NAME),
+        ('max_drivers', c.DEFAULT_MAX_DRIVERS),
+        ('headless', c.DEFAULT_HEADLESS),
+        ('persist_sessions', c.DEFAULT_PERSIST_SESSIONS),
+        ('tasks_parser', c.DEFAULT_TASKS_PARSER),
+        ('max_tasks_page_fetchers', c.DEFAULT_MAX_TASKS_PAGE_FETCHERS),
+        ('job_wait_backend', c.DEFAULT_JOB_WAIT_BACKEND),
+        ('transfer_start_backend', c.DEFAULT_TRANSFER_START_BACKEND),
+        ('unit_removal_backend', c.DEFAULT_UNIT_REMOVAL_BACKEND),
+        ('aip_wait_backend', c.DEFAULT_AIP_WAIT_BACKEND),
+        ('aip_wait_gui_check', c.DEFAULT_AIP_WAIT_GUI_CHECK),
+        ('max_http_connections', c.DEFAULT_MAX_HTTP_CONNECTIONS),
+        ('http_retries', c.DEFAULT_HTTP_RETRIES),
+        ('aip_download_segments', c.DEFAULT_AIP_DOWNLOAD_SEGMENTS),
+        ('verify_aip_downloads', c.DEFAULT_VERIFY_AIP_DOWNLOADS),
         ('ssh_accessible', None),
         ('ssh_requires_password', None),
         ('server_user', None),
@@ -107,7 +128,9 @@ class Base:
 
     @staticmethod
     def unique_name(name):
-        return '{}_{}'.format(name, utils.unixtimestamp())
+        with _UNIQUE_NAME_LOCK:
+            count = next(_UNIQUE_NAME_COUNTER)
+        return '{}_{}_{}'.format(name, utils.unixtimestamp(), count)
 
     @property
     def permanent_path(self):
@@ -133,6 +156,44 @@ class Base:
             elif os.path.isdir(thing_path):
                 shutil.rmtree(thing_path)
 
+    def get_am_http_session(self, refresh=False):
+        """Return a Requests session that is logged in to the dashboard. The
+        session's cookies come from ``self.session_store`` and its connections
+        from ``self.http_client``, both of which must be supplied by the
+        ``ArchivematicaUser`` that owns this instance.
+        """
+        if refresh:
+            self.session_store.invalidate(self.am_url, self.am_username)
+        return self.session_store.get_http_session(
+            self.am_url, self.am_username, self.am_password,
+            self.get_login_url(), self.http_client)
+
+    def get_ss_http_session(self, refresh=False):
+        """Return a Requests session that is logged in to the SS."""
+        if refresh:
+            self.session_store.invalidate(self.ss_url, self.ss_username)
+        return self.session_store.get_http_session(
+            self.ss_url, self.ss_username, self.ss_password,
+            self.get_ss_login_url(), self.http_client)
+
+    def am_http_get(self, url, **kwargs):
+        """GET ``url`` from the dashboard using an authenticated session,
+        logging in again if the stored session turns out to have expired.
+        """
+        r = self.get_am_http_session().get(url, **kwargs)
+        if r.url.startswith(self.get_login_url()):
+            r = self.get_am_http_session(refresh=True).get(url, **kwargs)
+        return r
+
+    def ss_http_get(self, url, **kwargs):
+        """GET ``url`` from the SS using an authenticated session, logging in
+        again if the stored session turns out to have expired.
+        """
+        r = self.get_ss_http_session().get(url, **kwargs)
+        if r.url.startswith(self.get_ss_login_url()):
+            r = self.get_ss_http_session(refresh=True).get(url, **kwargs)
+        return r
+
     @property
     def am_hostname(self):
         return parse.urlparse(self.am_url).hostname
@@ -11,14 +11,91 @@ DEFAULT_SS_URL = 'http://192.168.168.192:8000/'
 DEFAULT_AM_API_KEY = None
 DEFAULT_SS_API_KEY = None
 DEFAULT_DRIVER_NAME = 'Chrome'  # 'Firefox' should also work.
+# Maximum number of live browsers (Selenium drivers) kept in the driver pool.
+DEFAULT_MAX_DRIVERS = 3
+# Whether to run the browsers headless, with lightweight profiles.
+DEFAULT_HEADLESS = False
+# How to parse the tasks pages of jobs: 'browser' scrapes them with Selenium,
+# 'http' fetches them with Requests and parses them with lxml.
+DEFAULT_TASKS_PARSER = 'browser'
+# Maximum number of tasks pages that the 'http' tasks parser fetches at once.
+DEFAULT_MAX_TASKS_PAGE_FETCHERS = 8
+# How to wait for jobs: 'browser' watches the Transfer and Ingest tabs,
+# 'api' polls the dashboard's status JSON.
+DEFAULT_JOB_WAIT_BACKEND = 'browser'
+# How to start transfers: 'browser' uses the Transfer tab, 'api' uses the
+# dashboard API.
+DEFAULT_TRANSFER_START_BACKEND = 'browser'
+# How to close all transfers or SIPs: 'browser' removes every unit in the
+# Transfer or Ingest tab, 'api' removes only the completed units in bulk using
+# the dashboard API.
+DEFAULT_UNIT_REMOVAL_BACKEND = 'browser'
+# How to wait for AIPs to be stored (and for DIPs to appear in the transfer
+# backlog): 'browser' searches the Archival Storage (Backlog) tab, 'api' polls
+# the SS's file resource of the AIP (the dashboard's backlog search JSON).
+DEFAULT_AIP_WAIT_BACKEND = 'browser'
+# Whether the 'api' AIP wait backend should finally check that the AIP can
+# also be found by searching the Archival Storage tab.
+DEFAULT_AIP_WAIT_GUI_CHECK = False
+# Field and query type that the dashboard's backlog search uses for the
+# "SIP UUID" field and the "Phrase" query type.
+BACKLOG_SEARCH_FIELD_SIP_UUID = 'sipuuid'
+BACKLOG_SEARCH_TYPE_PHRASE = 'string'
+# Status of a package in the SS once it has been stored.
+SS_PACKAGE_STATUS_STORED = 'UPLOADED'
+# Maximum number of kept-alive HTTP connections per host and number of times
+# idempotent HTTP requests are retried (with exponential backoff).
+DEFAULT_MAX_HTTP_CONNECTIONS = 10
+DEFAULT_HTTP_RETRIES = 3
+HTTP_RETRY_BACKOFF_FACTOR = 0.5
+# Number of hosts whose connection pools the HTTP client keeps.
+MAX_HTTP_HOSTS = 10
+# Timeout (in seconds) for connecting to a host and for each read.
+HTTP_TIMEOUT = 120
+# Maximum number of units that are removed at once when closing all units
+# using the dashboard API.
+MAX_CONCURRENT_UNIT_REMOVALS = 8
+# Archivematica's shared directory on the pipeline's file system.
+AM_SHARED_DIR = '/var/archivematica/sharedDirectory'
+# Size (in bytes) of the chunks in which downloads are streamed.
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Size (in bytes) of the chunks in which AIPs are downloaded and of the
+# smallest segment that an AIP download is split into.
+AIP_DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+MIN_DOWNLOAD_SEGMENT_SIZE = 64 * 1024 * 1024
+# Number of byte ranges that large AIPs are downloaded as, in parallel.
+DEFAULT_AIP_DOWNLOAD_SEGMENTS = 1
+# Whether the checksums of downloaded AIPs are verified against the fixity in
+# their pointer files.
+DEFAULT_VERIFY_AIP_DOWNLOADS = False
+# Extensions of compressed packages, i.e., of the AIPs that have pointer files.
+COMPRESSED_PACKAGE_EXTENSIONS = ('.7z', '.tar.gz', '.tar.bz2', '.zip')
 DUMMY_VAL = 'Archivematica Acceptance Test'
 METADATA_ATTRS = ('title', 'creator')
 JOB_OUTPUTS_COMPLETE = (
     'Failed',
     'Completed successfully',
     'Awaiting decision')
+# AM 1.7+ reports the current step of jobs in the status JSON as an integer.
+JOB_STATUS_CODES2OUTPUTS = {
+    0: 'Unknown',
+    1: 'Awaiting decision',
+    2: 'Completed successfully',
+    3: 'Executing command(s)',
+    4: 'Failed'}
+# Once a job has one of these outputs its tasks no longer change.
+JOB_OUTPUTS_TERMINAL = (
+    'Failed',
+    'Completed successfully')
 TMP_DIR_NAME = '.amsc-tmp'
 PERM_DIR_NAME = 'data'
+# Whether to persist authenticated sessions (cookies) on disk, in a file named
+# SESSIONS_FILE_NAME in PERM_DIR_NAME, so that later test runs can re-use them.
+DEFAULT_PERSIST_SESSIONS = False
+SESSIONS_FILE_NAME = 'sessions.json'
+# Parsed tasks of terminated jobs are cached in this directory in
+# PERM_DIR_NAME, one JSON file per job UUID.
+TASKS_CACHE_DIR_NAME = 'tasks-cache'
 
 
 # CSS classes and selectors
@@ -326,6 +403,31 @@ PC_DECISION2ID = {
         'id_92879a29-45bf-4f0b-ac43-e64474f0f2f9'
 }
 
+# Maps AM versions to the micro-service names that must be treated as other
+# names in that version. This allows for different AM versions to use
+# different names for the same micro-service, without us having to change a
+# whole bunch of feature files. Versions not listed here use the aliases of
+# ``LATEST_MS_NAME_ALIASES_VERSION``.
+MS_NAME_ALIASES = {
+    '1.6': {
+        'Store AIP Review': 'Store AIP (review)',
+        'Approve normalization Review': 'Approve normalization (review)',
+    },
+    '1.7': {
+        'Approve normalization (review)': 'Approve normalization Review',
+        'Store AIP (review)': 'Store AIP Review',
+    },
+}
+LATEST_MS_NAME_ALIASES_VERSION = '1.7'
+
+# Maps the transfer types of the Transfer tab to those of the dashboard API.
+TRANSFER_TYPES2API_TYPES = {
+    'Standard': 'standard',
+    'Unzipped bag': 'unzipped bag',
+    'Zipped bag': 'zipped bag',
+    'DSpace': 'dspace',
+}
+
 # Namespace map for parsing METS XML.
 METS_NSMAP = {
     'mets': 'http://www.loc.gov/METS/',
@@ -347,6 +449,10 @@ METS_NSMAP = {
 # when using ``behave`` is to use Behave "user data" flags, e.g.,
 # ``behave -D nihilistic_wait=30``.
 
+# Browser window size used in headless mode. It must be wide enough for the
+# dashboard to use its wide layout, in which unit UUIDs are visible.
+HEADLESS_WINDOW_SIZE = (1700, 900)
+
 # Generable, reusable wait times, in seconds
 NIHILISTIC_WAIT = 20
 APATHETIC_WAIT = 10
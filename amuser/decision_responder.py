@@ -0,0 +1,184 @@
+"""Decision Responder.
+
+This module contains the ``DecisionResponder`` class, which answers decision
+points declaratively: given a mapping from decision point names to choices, it
+watches the dashboard's status JSON (using the shared status watcher) for any
+of those decision points awaiting a decision in the given units and makes the
+choice as soon as each one appears. The decisions of several units are thus
+answered in parallel, instead of by a serial script of "wait for decision
+point, make choice" steps.
+"""
+
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+import logging
+import threading
+import time
+
+from . import am_api_ability
+from . import base
+from . import utils
+
+
+logger = logging.getLogger('amuser.decisionresponder')
+
+
+class ArchivematicaDecisionResponderError(base.ArchivematicaUserError):
+    pass
+
+
+class DecisionResponder:
+    """Answers the decision points in ``decisions`` (a dict from decision
+    point name to choice text) of the transfers named ``unit_names`` and of
+    the SIPs created from them, using API ability ``api``. As elsewhere, a
+    decision point name may be qualified by its micro-service group, e.g.,
+    ``'Select file format identification command|Process submission
+    documentation'``. Choices are executed on the responder's own worker
+    thread, so that the status watcher's polling thread never blocks on
+    them.
+    """
+
+    def __init__(self, api, decisions, unit_names, timeout):
+        self.api = api
+        self.unit_names = list(unit_names)
+        self.deadline = time.time() + timeout
+        self.decisions = []
+        for decision, choice in decisions.items():
+            ms_name, _, group_name = decision.partition('|')
+            ms_name = utils.normalize_ms_name(ms_name, api.vn)
+            self.decisions.append(
+                (decision, utils.squash(ms_name), utils.squash(group_name),
+                 choice))
+        self.lock = threading.Lock()
+        self.answered = []
+        self.answered_job_uuids = set()
+        # Every unit must answer every decision, so what is pending is a set
+        # of ``(unit_name, decision)`` pairs.
+        self.pending_decisions = {
+            (unit_name, decision) for unit_name in self.unit_names
+            for decision in decisions}
+        self.error = None
+        self.done = threading.Event()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def start(self):
+        self._watch()
+        return self
+
+    def wait(self):
+        """Block until every decision has been answered (or we have given up)
+        and return the list of answers. Each answer is a dict with the
+        ``decision``, ``choice``, ``job_uuid``, ``unit_uuid``, ``unit_name``
+        and ``unit_type``.
+        """
+        self.done.wait()
+        self.executor.shutdown()
+        if self.error:
+            raise self.error
+        return self.answered
+
+    def _watch(self):
+        timeout = max(0, self.deadline - time.time())
+        future = self.api.status_watcher.watch(
+            self._find_awaiting_decisions, timeout=timeout,
+            description='decisions {} in units {}'.format(
+                sorted(self.pending_decisions), self.unit_names))
+        future.add_done_callback(self._on_awaiting_decisions)
+
+    def _get_unit_name(self, unit):
+        """Return the name in ``unit_names`` of the transfer that ``unit`` is
+        (or that its SIP was created from), or ``None`` if it is not ours.
+        """
+        directory = unit.get('directory', '')
+        if directory in self.unit_names:
+            return directory
+        for name in self.unit_names:
+            if directory.startswith(name + '-'):
+                return name
+        return None
+
+    def _match_decision(self, job):
+        squashed_name = utils.squash(job['name'])
+        squashed_group_name = utils.squash(job['group_name'] or '')
+        for decision, ms_name, group_name, choice in self.decisions:
+            if squashed_name != ms_name:
+                continue
+            if group_name and squashed_group_name != group_name:
+                continue
+            return decision, choice
+        return None, None
+
+    def _find_awaiting_decisions(self, statuses):
+        """Status watcher predicate: return the list of decision point jobs of
+        our units that we can answer, or ``None`` if there are none.
+        """
+        awaiting = []
+        for unit_type, units in statuses.items():
+            for unit in units:
+                unit_name = self._get_unit_name(unit)
+                if not unit_name:
+                    continue
+                for job in unit.get('jobs', []):
+                    job = am_api_ability.normalize_status_job(job)
+                    if (job['current_step'] != 'Awaiting decision' or
+                            job['uuid'] in self.answered_job_uuids):
+                        continue
+                    decision, choice = self._match_decision(job)
+                    if (decision and
+                            (unit_name, decision) in self.pending_decisions):
+                        awaiting.append(
+                            (unit_type, unit, unit_name, job, decision,
+                             choice))
+        return awaiting or None
+
+    def _on_awaiting_decisions(self, future):
+        """Status watcher callback; runs on the watcher's polling thread, so
+        hand the (HTTP) work of answering the decisions off to our executor.
+        """
+        try:
+            awaiting = future.result()
+        except CancelledError:
+            self.done.set()
+            return
+        except Exception as exc:  # pylint: disable=broad-except
+            self.error = exc
+            self.done.set()
+            return
+        self.executor.submit(self._answer_all, awaiting)
+
+    def _answer_all(self, awaiting):
+        try:
+            for unit_type, unit, unit_name, job, decision, choice in awaiting:
+                self._answer(unit_type, unit, unit_name, job, decision, choice)
+        except Exception as exc:  # pylint: disable=broad-except
+            self.error = exc
+            self.done.set()
+            return
+        if self.pending_decisions:
+            self._watch()
+        else:
+            self.done.set()
+
+    def _answer(self, unit_type, unit, unit_name, job, decision,
+                choice_text):
+        choice_value = None
+        for value, label in job['choices']:
+            if utils.squash(choice_text) in utils.squash(label):
+                choice_value = value
+        if choice_value is None:
+            raise ArchivematicaDecisionResponderError(
+                'Unable to find choice "{}" at decision point "{}"; the'
+                ' choices are {}'.format(
+                    choice_text, decision, [x[1] for x in job['choices']]))
+        logger.info('Choosing "%s" at decision point "%s" of %s %s',
+                    choice_text, decision, unit_type, unit.get('directory'))
+        self.api.execute_choice(job['uuid'], choice_value)
+        with self.lock:
+            self.answered_job_uuids.add(job['uuid'])
+            self.pending_decisions.discard((unit_name, decision))
+            self.answered.append({
+                'decision': decision,
+                'choice': choice_text,
+                'job_uuid': job['uuid'],
+                'unit_uuid': unit.get('uuid'),
+                'unit_name': unit.get('directory'),
+                'unit_type': unit_type})
@@ -0,0 +1,177 @@
+"""HTTP Client.
+
+This module contains the ``HTTPClient`` class, a pooled, thread-safe HTTP
+client that all of an ``ArchivematicaUser``'s abilities share. Every Requests
+session that the client hands out is mounted on the same connection pools, so
+connections to the dashboard and the Storage Service (SS) are kept alive and
+re-used across abilities, threads and scenarios. At most
+``max_connections_per_host`` connections per host are kept alive; requests
+beyond that get a short-lived connection of their own rather than wait,
+possibly forever, for a pooled one. Idempotent requests are retried with
+exponential backoff on connection errors and gateway errors.
+"""
+
+import collections
+import logging
+import threading
+
+try:
+    from urllib import parse
+except ImportError:  # above is available in py3+, below is py2.7
+    import urlparse as parse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import AuthBase
+from urllib3.util.retry import Retry
+
+from . import constants as c
+
+
+logger = logging.getLogger('amuser.http')
+
+
+IDEMPOTENT_METHODS = frozenset(
+    ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'TRACE'))
+RETRY_STATUS_CODES = (502, 503, 504)
+
+
+# HTTP clients are process-wide, keyed by their configuration, so that
+# concurrent scenarios share the same connection pools.
+_HTTP_CLIENTS = {}
+_HTTP_CLIENTS_LOCK = threading.Lock()
+
+
+def get_http_client(max_connections_per_host=c.DEFAULT_MAX_HTTP_CONNECTIONS,
+                    retries=c.DEFAULT_HTTP_RETRIES):
+    """Return the process-wide ``HTTPClient`` with the given configuration."""
+    key = (max_connections_per_host, retries)
+    with _HTTP_CLIENTS_LOCK:
+        client = _HTTP_CLIENTS.get(key)
+        if client is None:
+            client = _HTTP_CLIENTS[key] = HTTPClient(
+                max_connections_per_host=max_connections_per_host,
+                retries=retries)
+        return client
+
+
+def log_http_timings():
+    with _HTTP_CLIENTS_LOCK:
+        clients = list(_HTTP_CLIENTS.values())
+    for client in clients:
+        client.log_timings()
+
+
+def get_retry(retries, backoff_factor=c.HTTP_RETRY_BACKOFF_FACTOR):
+    """Return a urllib3 retry policy that retries idempotent requests up to
+    ``retries`` times with exponential backoff.
+    """
+    kwargs = {'total': retries,
+              'backoff_factor': backoff_factor,
+              'status_forcelist': RETRY_STATUS_CODES,
+              'raise_on_status': False}
+    try:
+        return Retry(allowed_methods=IDEMPOTENT_METHODS, **kwargs)
+    except TypeError:  # urllib3 < 1.26
+        return Retry(method_whitelist=IDEMPOTENT_METHODS, **kwargs)
+
+
+class ApiKeyAuth(AuthBase):
+    """Authenticates requests to the dashboard API or to the SS API with the
+    ``ApiKey <username>:<api_key>`` authorization header.
+    """
+
+    def __init__(self, username, api_key):
+        self.username = username
+        self.api_key = api_key
+
+    def __call__(self, request):
+        request.headers['Authorization'] = 'ApiKey {}:{}'.format(
+            self.username, self.api_key)
+        return request
+
+
+class HTTPClient:
+    """A pooled HTTP client. Requests sessions are not safe to share between
+    threads, so ``request`` uses one session per thread; all sessions share
+    the client's connection pools. Timing hooks, i.e., callables added with
+    ``add_timing_hook``, are called with the method, URL, status code and
+    elapsed time (in seconds) of every response.
+    """
+
+    def __init__(self, max_connections_per_host=c.DEFAULT_MAX_HTTP_CONNECTIONS,
+                 retries=c.DEFAULT_HTTP_RETRIES, timeout=c.HTTP_TIMEOUT):
+        self.adapter = HTTPAdapter(
+            pool_connections=c.MAX_HTTP_HOSTS,
+            pool_maxsize=max_connections_per_host,
+            pool_block=False,
+            max_retries=get_retry(retries))
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.timing_hooks = []
+        # Number of responses and total elapsed time per host.
+        self.timings = collections.defaultdict(lambda: [0, 0.0])
+
+    def add_timing_hook(self, hook):
+        with self.lock:
+            self.timing_hooks.append(hook)
+
+    def session(self, cookies=None):
+        """Return a new Requests session that uses the client's connection
+        pools, optionally with ``cookies`` (in the list-of-dicts format of
+        ``SessionStore``).
+        """
+        s = requests.Session()
+        s.mount('http://', self.adapter)
+        s.mount('https://', self.adapter)
+        s.hooks['response'].append(self.record_timing)
+        for cookie in cookies or ():
+            s.cookies.set(cookie['name'], cookie['value'],
+                          path=cookie.get('path', '/'))
+        return s
+
+    @property
+    def thread_session(self):
+        s = getattr(self.local, 'session', None)
+        if s is None:
+            s = self.local.session = self.session()
+        return s
+
+    def request(self, method, url, **kwargs):
+        """Make a request with this thread's session. Pass a requests auth
+        object (e.g., ``ApiKeyAuth``) as ``auth`` to authenticate it.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        return self.thread_session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def record_timing(self, response, *args, **kwargs):
+        elapsed = response.elapsed.total_seconds()
+        method = response.request.method
+        host = parse.urlparse(response.url).netloc
+        logger.debug('%s %s -> %s in %.3fs', method, response.url,
+                     response.status_code, elapsed)
+        with self.lock:
+            timing = self.timings[host]
+            timing[0] += 1
+            timing[1] += elapsed
+            hooks = list(self.timing_hooks)
+        for hook in hooks:
+            hook(method, response.url, response.status_code, elapsed)
+        return response
+
+    def log_timings(self):
+        with self.lock:
+            timings = dict(self.timings)
+        for host, (count, total) in sorted(timings.items()):
+            logger.info('%s requests to %s took %.3fs in total (%.3fs on'
+                        ' average)', count, host, total, total / count)
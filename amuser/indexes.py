@@ -0,0 +1,107 @@
+"""Lookup indexes.
+
+This module builds, once, the indexes that we use to look up micro-service
+groups, processing configuration decisions and version-specific micro-service
+names. These lookups happen on every poll of every wait loop so they should not
+require scanning the maps in the constants module.
+"""
+
+import functools
+
+from . import constants as c
+from . import utils
+
+
+class PrefixTrie:
+    """Maps each prefix of the inserted keys to the value of the first
+    inserted key that starts with that prefix.
+    """
+
+    # Key under which each node stores its value; no character is empty.
+    _VALUE = ''
+
+    def __init__(self, items=()):
+        self.root = {}
+        for key, value in items:
+            self.insert(key, value)
+
+    def insert(self, key, value):
+        node = self.root
+        node.setdefault(self._VALUE, value)
+        for char in key:
+            node = node.setdefault(char, {})
+            node.setdefault(self._VALUE, value)
+
+    def get(self, prefix, default=None):
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return default
+        return node.get(self._VALUE, default)
+
+
+def _first_by(items, key_func):
+    """Return a dict from ``key_func(key)`` to the value of the first of the
+    ``(key, value)`` ``items`` that has that key.
+    """
+    index = {}
+    for key, value in items:
+        index.setdefault(key_func(key), value)
+    return index
+
+
+@functools.lru_cache(maxsize=None)
+def get_micro_services2groups_squashed():
+    """Return the index from squashed micro-service names to their groups.
+    It is built on first use rather than at import time because ``utils``
+    imports this module.
+    """
+    return _first_by(c.MICRO_SERVICES2GROUPS.items(), utils.squash)
+
+# Processing configuration decision labels to decision ids: lower-cased, in a
+# prefix trie and as a list for substring matching (in original order).
+PC_DECISION2ID_LOWER = _first_by(c.PC_DECISION2ID.items(), str.lower)
+PC_DECISION2ID_TRIE = PrefixTrie(
+    (label.lower(), id_) for label, id_ in c.PC_DECISION2ID.items())
+PC_DECISION2ID_LOWER_ITEMS = tuple(
+    (label.lower(), id_) for label, id_ in c.PC_DECISION2ID.items())
+
+
+def get_micro_service_groups(micro_service):
+    """Return the tuple of groups of micro-service ``micro_service``, matching
+    its name exactly or, failing that, squashed. Raise ``KeyError`` if it is
+    not known.
+    """
+    try:
+        return c.MICRO_SERVICES2GROUPS[micro_service]
+    except KeyError:
+        return get_micro_services2groups_squashed()[
+            utils.squash(micro_service)]
+
+
+def get_decision_id(decision_label):
+    """Return the id of the processing configuration decision whose label is
+    ``decision_label``, starts with it or (failing that) contains it, ignoring
+    case. Return ``None`` if there is no such decision.
+    """
+    decision_id = c.PC_DECISION2ID.get(decision_label)
+    if decision_id is not None:
+        return decision_id
+    decision_label = decision_label.lower()
+    decision_id = PC_DECISION2ID_LOWER.get(decision_label)
+    if decision_id is not None:
+        return decision_id
+    decision_id = PC_DECISION2ID_TRIE.get(decision_label)
+    if decision_id is not None:
+        return decision_id
+    for label, id_ in PC_DECISION2ID_LOWER_ITEMS:
+        if decision_label in label:
+            return id_
+    return None
+
+
+def get_ms_name_aliases(vn):
+    """Return the micro-service name aliases of AM version ``vn``."""
+    return c.MS_NAME_ALIASES.get(
+        vn, c.MS_NAME_ALIASES[c.LATEST_MS_NAME_ALIASES_VERSION])
@@ -1,7 +1,10 @@
 """Selenium Ability"""
 
+import atexit
 import logging
 import os
+import threading
+import time
 
 from selenium import webdriver
 from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
@@ -16,6 +19,7 @@ from selenium.common.exceptions import (
 from selenium.webdriver.common.action_chains import ActionChains
 
 from . import base
+from . import constants as c
 
 
 logger = logging.getLogger('amuser.selenium')
@@ -25,6 +29,121 @@ class ArchivematicaSeleniumError(base.ArchivematicaUserError):
     pass
 
 
+class DriverPool:
+    """A pool of live Selenium drivers (i.e., browsers) that outlives any
+    single ``ArchivematicaUser`` instance. Drivers are checked out and back in
+    so that browser processes stay warm across scenarios. At most ``max_size``
+    drivers are ever alive at the same time; checking out a driver when all of
+    them are in use blocks until one is checked back in.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max(int(max_size), 1)
+        self.idle = []
+        self.live = []
+        self.condition = threading.Condition()
+
+    def checkout(self, factory, timeout=None):
+        """Return an idle driver, creating a new one by calling ``factory`` if
+        we are below the cap, or wait up to ``timeout`` seconds for another
+        user to check one in.
+        """
+        deadline = None
+        if timeout is not None:
+            deadline = time.time() + timeout
+        while True:
+            with self.condition:
+                while not self.idle and len(self.live) >= self.max_size:
+                    remaining = None
+                    if deadline is not None:
+                        remaining = deadline - time.time()
+                        if remaining <= 0:
+                            raise ArchivematicaSeleniumError(
+                                'Timed out waiting for one of the {} pooled'
+                                ' drivers to become available'.format(
+                                    self.max_size))
+                    self.condition.wait(remaining)
+                if self.idle:
+                    driver = self.idle.pop()
+                else:
+                    driver = None
+                    # Reserve the slot while the browser is starting up.
+                    self.live.append(driver)
+            if driver is None:
+                try:
+                    driver = factory()
+                except Exception:
+                    with self.condition:
+                        self.live.remove(None)
+                        self.condition.notify()
+                    raise
+                with self.condition:
+                    self.live[self.live.index(None)] = driver
+                return driver
+            if is_driver_alive(driver):
+                return driver
+            logger.info('Discarding dead pooled driver %s', driver)
+            self.discard(driver)
+
+    def checkin(self, driver):
+        with self.condition:
+            if driver in self.live and driver not in self.idle:
+                self.idle.append(driver)
+            self.condition.notify()
+
+    def discard(self, driver):
+        """Quit ``driver`` and forget about it, freeing its slot."""
+        with self.condition:
+            if driver in self.idle:
+                self.idle.remove(driver)
+            if driver in self.live:
+                self.live.remove(driver)
+            self.condition.notify()
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+    def close(self):
+        """Quit all drivers, including those that are still checked out."""
+        with self.condition:
+            drivers = [d for d in self.live if d is not None]
+            self.idle = []
+            self.live = []
+            self.condition.notify_all()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+
+
+# Driver pools are process-wide and keyed by driver profile so that drivers
+# survive the per-scenario re-instantiation of ``ArchivematicaUser``.
+_DRIVER_POOLS = {}
+_DRIVER_POOLS_LOCK = threading.Lock()
+
+
+def close_driver_pools():
+    """Quit every pooled driver. Call this once, after all tests have run."""
+    with _DRIVER_POOLS_LOCK:
+        pools = list(_DRIVER_POOLS.values())
+        _DRIVER_POOLS.clear()
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(close_driver_pools)
+
+
+def is_driver_alive(driver):
+    try:
+        driver.current_url
+    except WebDriverException:
+        return False
+    return True
+
+
 class ArchivematicaSeleniumAbility(base.Base):
     """Archivematica Selenium Ability: common, reusable Selenium-based
     functionality for superclasses.
@@ -35,10 +154,74 @@ class ArchivematicaSeleniumAbility(base.Base):
         self.driver = None
         self.all_drivers = []
 
+    @property
+    def driver_profile(self):
+        """A hashable description of the drivers that this ability creates;
+        drivers with the same profile are interchangeable and share a pool.
+        """
+        return (self.driver_name, self.headless)
+
+    @property
+    def driver_pool(self):
+        with _DRIVER_POOLS_LOCK:
+            pool = _DRIVER_POOLS.get(self.driver_profile)
+            if pool is None:
+                pool = _DRIVER_POOLS[self.driver_profile] = DriverPool(
+                    self.max_drivers)
+            return pool
+
     def get_driver(self):
-        if self.driver_name == 'Chrome':
+        """Check a driver out of the driver pool. The driver remains checked
+        out by this ability until it is passed to ``release_driver`` or until
+        ``tear_down`` is called.
+        """
+        driver = self.driver_pool.checkout(
+            self.create_driver, timeout=self.nihilistic_wait * 3)
+        self.all_drivers.append(driver)
+        return driver
+
+    def release_driver(self, driver):
+        """Reset ``driver`` and check it back in to the driver pool. Drivers
+        that cannot be reset are quit and discarded.
+        """
+        if driver in self.all_drivers:
+            self.all_drivers.remove(driver)
+        try:
+            self.reset_driver(driver)
+        except WebDriverException:
+            logger.info('Unable to reset driver %s; discarding it', driver)
+            self.driver_pool.discard(driver)
+        else:
+            self.driver_pool.checkin(driver)
+
+    def reset_driver(self, driver):
+        """Restore ``driver`` to a pristine state: a single window, no cookies
+        for the dashboard or the SS, a blank page and the standard window size.
+        Selenium can only delete the cookies of the current domain, so we
+        visit the login page of each in turn. Closing extra windows is skipped
+        in Firefox because requesting its window handles can cause Selenium to
+        hang.
+        """
+        if self.driver_name != 'Firefox':
+            window_handles = driver.window_handles
+            for window_handle in window_handles[1:]:
+                driver.switch_to.window(window_handle)
+                driver.close()
+            driver.switch_to.window(window_handles[0])
+        for login_url in (self.get_login_url(), self.get_ss_login_url()):
+            driver.get(login_url)
+            driver.delete_all_cookies()
+        driver.get('about:blank')
+        self.set_window_state(driver)
+
+    def create_driver(self):
+        """Launch a new browser. Only the driver pool should call this; use
+        ``get_driver`` instead.
+        """
+        if self.headless:
+            driver = self.create_headless_driver()
+        elif self.driver_name == 'Chrome':
             driver = webdriver.Chrome()
-            driver.set_window_size(1700, 900)
         elif self.driver_name == 'Chrome-Hub':
             capabilities = DesiredCapabilities.CHROME.copy()
             capabilities["chrome.switches"] = [
@@ -48,7 +231,6 @@ class ArchivematicaSeleniumAbility(base.Base):
             driver = webdriver.Remote(
                 command_executor=os.environ.get('HUB_ADDRESS'),
                 desired_capabilities=capabilities)
-            driver.set_window_size(1200, 900)
         elif self.driver_name == 'Firefox':
             fp = webdriver.FirefoxProfile()
             fp.set_preference("dom.max_chrome_script_run_time", 0)
@@ -61,50 +243,120 @@ class ArchivematicaSeleniumAbility(base.Base):
         else:
             driver = getattr(webdriver, self.driver_name)()
         driver.set_script_timeout(self.apathetic_wait)
-        self.all_drivers.append(driver)
+        self.set_window_state(driver)
         return driver
 
-    def set_up(self):
-        self.driver = self.get_driver()
+    def create_headless_driver(self):
+        """Launch a new headless Chrome or Firefox browser (locally or via
+        the hub) with a lightweight profile: no images, no web fonts, no
+        extensions and the 'eager' page load strategy, i.e., do not wait for
+        sub-resources before considering a page loaded.
+        """
+        width, height = c.HEADLESS_WINDOW_SIZE
+        if self.driver_name in ('Chrome', 'Chrome-Hub'):
+            options = webdriver.ChromeOptions()
+            for argument in ('--headless',
+                             '--disable-gpu',
+                             '--disable-extensions',
+                             '--disable-remote-fonts',
+                             '--blink-settings=imagesEnabled=false',
+                             '--hide-scrollbars',
+                             '--mute-audio',
+                             '--ignore-certificate-errors',
+                             '--window-size={},{}'.format(width, height)):
+                options.add_argument(argument)
+            options.add_experimental_option(
+                'prefs', {'profile.managed_default_content_settings.images': 2})
+            capabilities = DesiredCapabilities.CHROME.copy()
+            capabilities['pageLoadStrategy'] = 'eager'
+            if self.driver_name == 'Chrome':
+                return webdriver.Chrome(chrome_options=options,
+                                        desired_capabilities=capabilities)
+            capabilities.update(options.to_capabilities())
+            return webdriver.Remote(
+                command_executor=os.environ.get('HUB_ADDRESS'),
+                desired_capabilities=capabilities)
+        if self.driver_name in ('Firefox', 'Firefox-Hub'):
+            fp = webdriver.FirefoxProfile()
+            fp.set_preference("dom.max_chrome_script_run_time", 0)
+            fp.set_preference("dom.max_script_run_time", 0)
+            fp.set_preference('permissions.default.image', 2)
+            fp.set_preference('browser.display.use_document_fonts', 0)
+            fp.set_preference('gfx.downloadable_fonts.enabled', False)
+            fp.set_preference('extensions.enabledScopes', 0)
+            fp.set_preference('media.autoplay.enabled', False)
+            options = webdriver.FirefoxOptions()
+            options.add_argument('-headless')
+            options.add_argument('--width={}'.format(width))
+            options.add_argument('--height={}'.format(height))
+            capabilities = DesiredCapabilities.FIREFOX.copy()
+            capabilities['pageLoadStrategy'] = 'eager'
+            if self.driver_name == 'Firefox':
+                return webdriver.Firefox(firefox_profile=fp,
+                                         firefox_options=options,
+                                         capabilities=capabilities)
+            capabilities.update(options.to_capabilities())
+            return webdriver.Remote(
+                command_executor=os.environ.get('HUB_ADDRESS'),
+                desired_capabilities=capabilities,
+                browser_profile=fp)
+        raise ArchivematicaSeleniumError(
+            'Headless mode is not supported for driver {}'.format(
+                self.driver_name))
+
+    def set_window_state(self, driver):
+        if self.headless:
+            # Headless browsers cannot be maximized; use a fixed viewport
+            # that keeps the dashboard in its wide layout.
+            driver.set_window_size(*c.HEADLESS_WINDOW_SIZE)
         # Do not maximize window in Chrome to workaround:
         # https://bugs.chromium.org/p/chromedriver/issues/detail?id=1901
-        if self.driver_name not in ('Chrome-Hub', 'Chrome'):
-            self.driver.maximize_window()
+        elif self.driver_name == 'Chrome':
+            driver.set_window_size(1700, 900)
+        elif self.driver_name == 'Chrome-Hub':
+            driver.set_window_size(1200, 900)
+        else:
+            driver.maximize_window()
+
+    def set_up(self):
+        self.driver = self.get_driver()
 
     def tear_down(self):
-        """Tear down by closing all of the browser windows, clearing the
-        temporary directory, and quitting all drivers.
-        TODO: figure out why in some cases (with some browsers, e.g., Firefox)
-        the following call to ``self.driver.window_handles`` causes Selenium to
-        hang indefinitely.
+        """Tear down by clearing the temporary directory and returning all of
+        the drivers checked out by this ability to the driver pool.
         """
-        if self.driver_name != 'Firefox':
-            for window_handle in self.driver.window_handles:
-                self.driver.switch_to.window(window_handle)
-                self.driver.quit()
         self.clear_tmp_dir()
-        for driver in self.all_drivers:
-            try:
-                driver.quit()
-            except WebDriverException:
-                pass
+        for driver in list(self.all_drivers):
+            self.release_driver(driver)
+        self.driver = None
 
     def navigate(self, url, reload=False):
-        """Navigate to ``url``; login and try again, if redirected."""
+        """Navigate to ``url``; login and try again, if redirected. If we are
+        still redirected to the login page after logging in with a stored
+        session, that session has expired: forget it and log in again using
+        the login form.
+        """
         if self.driver.current_url == url and not reload:
             return
         self.driver.get(url)
         if self.driver.current_url == url:
             return
-        if self.driver.current_url != url:
-            if self.driver.current_url.endswith('/installer/welcome/'):
-                self.setup_new_install()
-            else:
-                if url.startswith(self.ss_url):
-                    self.login_ss()
-                else:
-                    self.login()
+        if self.driver.current_url.endswith('/installer/welcome/'):
+            self.setup_new_install()
+            self.driver.get(url)
+            return
+        if url.startswith(self.ss_url):
+            base_url, username = self.ss_url, self.ss_username
+            login_url, login = self.get_ss_login_url(), self.login_ss
+        else:
+            base_url, username = self.am_url, self.am_username
+            login_url, login = self.get_login_url(), self.login
+        login()
         self.driver.get(url)
+        if self.driver.current_url.startswith(login_url):
+            self.session_store.invalidate(base_url, username)
+            login(use_stored_session=False)
+            self.driver.get(url)
 
     def wait_for_new_window(self, handles_before, timeout=None):
         timeout = timeout or self.apathetic_wait
@@ -0,0 +1,212 @@
+"""Session Store.
+
+This module contains the ``SessionStore`` class, which holds the authenticated
+cookies of the Archivematica dashboard and Storage Service (SS) so that we only
+have to log in to each of them once. The stored cookies are injected into new
+Selenium drivers and Requests sessions and, optionally, persisted on disk so
+that later test runs can re-use them too. Requests sessions are created by the
+shared ``HTTPClient`` and re-used per thread until the stored cookies change.
+"""
+
+import json
+import logging
+import os
+import threading
+
+import requests
+
+from . import base
+
+
+logger = logging.getLogger('amuser.sessionstore')
+
+
+class ArchivematicaSessionStoreError(base.ArchivematicaUserError):
+    pass
+
+
+# Session stores are process-wide, keyed by the path of the file that persists
+# them (``None`` for in-memory stores), so that they outlive the per-scenario
+# ``ArchivematicaUser`` instances.
+_SESSION_STORES = {}
+_SESSION_STORES_LOCK = threading.Lock()
+
+
+def get_session_store(path=None):
+    """Return the process-wide ``SessionStore`` that persists to ``path``."""
+    with _SESSION_STORES_LOCK:
+        store = _SESSION_STORES.get(path)
+        if store is None:
+            store = _SESSION_STORES[path] = SessionStore(path)
+        return store
+
+
+class SessionStore:
+    """Stores the cookie jars of authenticated dashboard and SS sessions,
+    keyed by base URL and username. Cookies are stored in the list-of-dicts
+    format that Selenium's ``get_cookies`` returns.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.lock = threading.RLock()
+        self.cookie_jars = {}
+        # Incremented whenever the cookies of a key change, so that stale
+        # per-thread HTTP sessions are replaced.
+        self.generations = {}
+        self.local = threading.local()
+        # Keys whose cookies are known to be good: they were captured in this
+        # process or checked against the server. Cookies loaded from disk may
+        # have expired since they were saved.
+        self.verified = set()
+        if path and os.path.isfile(path):
+            try:
+                with open(path) as filei:
+                    self.cookie_jars = json.load(filei)
+            except ValueError:
+                logger.warning('Ignoring corrupt session store file %s', path)
+
+    @staticmethod
+    def get_key(base_url, username):
+        return '{} {}'.format(base_url, username)
+
+    def get_cookies(self, base_url, username):
+        with self.lock:
+            return self.cookie_jars.get(self.get_key(base_url, username))
+
+    def set_cookies(self, base_url, username, cookies):
+        key = self.get_key(base_url, username)
+        with self.lock:
+            self.cookie_jars[key] = cookies
+            self.generations[key] = self.generations.get(key, 0) + 1
+            self.verified.add(key)
+            self.save()
+
+    def invalidate(self, base_url, username):
+        """Forget the session of ``username`` at ``base_url``, e.g., because
+        it has expired.
+        """
+        logger.info('Invalidating stored session of %s at %s', username,
+                    base_url)
+        key = self.get_key(base_url, username)
+        with self.lock:
+            self.cookie_jars.pop(key, None)
+            self.generations[key] = self.generations.get(key, 0) + 1
+            self.verified.discard(key)
+            self.save()
+
+    def get_verified_cookies(self, base_url, username, login_url,
+                             http_client):
+        """Return the stored cookies of ``username`` at ``base_url`` after
+        making sure, once per process, that they still authenticate us: an
+        authenticated GET of ``base_url`` must not be redirected to
+        ``login_url``. Expired sessions are invalidated and ``None`` is
+        returned.
+        """
+        key = self.get_key(base_url, username)
+        cookies = self.get_cookies(base_url, username)
+        if not cookies:
+            return None
+        with self.lock:
+            if key in self.verified:
+                return cookies
+        try:
+            r = http_client.session(cookies=cookies).get(base_url)
+            valid = r.ok and not r.url.startswith(login_url)
+        except requests.exceptions.RequestException as exc:
+            logger.warning('Unable to verify the stored session of %s at %s:'
+                           ' %s', username, base_url, exc)
+            valid = False
+        if not valid:
+            self.invalidate(base_url, username)
+            return None
+        with self.lock:
+            self.verified.add(key)
+        return cookies
+
+    def save(self):
+        """Persist the cookies to ``self.path``, readable and writable by the
+        owner only since they grant access to the dashboard and the SS.
+        """
+        if not self.path:
+            return
+        tmp_path = '{}.tmp'.format(self.path)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.chmod(tmp_path, 0o600)
+        with os.fdopen(fd, 'w') as fileo:
+            json.dump(self.cookie_jars, fileo)
+        os.replace(tmp_path, self.path)
+
+    def capture_from_driver(self, driver, base_url, username):
+        """Store the cookies of the logged-in Selenium ``driver``."""
+        self.set_cookies(base_url, username, driver.get_cookies())
+
+    def inject_into_driver(self, driver, base_url, username, landing_url,
+                           http_client):
+        """Add the stored cookies to Selenium ``driver``. Cookies can only be
+        added for the domain of the current page, so we first load
+        ``landing_url``, the login page at ``base_url``. Return ``False`` if
+        there is no valid stored session to inject.
+        """
+        cookies = self.get_verified_cookies(base_url, username, landing_url,
+                                            http_client)
+        if not cookies:
+            return False
+        driver.get(landing_url)
+        for cookie in cookies:
+            driver.add_cookie({key: cookie[key]
+                               for key in ('name', 'value', 'path', 'secure')
+                               if key in cookie})
+        logger.info('Injected stored session of %s at %s into driver',
+                    username, base_url)
+        return True
+
+    def login_http(self, base_url, username, password, login_url,
+                   http_client):
+        """Log in to the Django application at ``base_url`` by submitting its
+        login form with Requests and store the resulting cookies.
+        """
+        s = http_client.session()
+        s.get(login_url)
+        r = s.post(login_url,
+                   data={'username': username,
+                         'password': password,
+                         'csrfmiddlewaretoken': s.cookies.get('csrftoken', '')},
+                   headers={'Referer': login_url})
+        if not r.ok or r.url.split('?')[0] == login_url:
+            raise ArchivematicaSessionStoreError(
+                'Unable to log in to {} as {}'.format(base_url, username))
+        cookies = [{'name': cookie.name,
+                    'value': cookie.value,
+                    'path': cookie.path,
+                    'secure': cookie.secure}
+                   for cookie in s.cookies]
+        self.set_cookies(base_url, username, cookies)
+        return cookies
+
+    def get_http_session(self, base_url, username, password, login_url,
+                         http_client):
+        """Return a Requests session, created by ``http_client``, that is
+        authenticated to ``base_url``, logging in over HTTP only if there is no
+        stored session. Each thread gets its own session, which is re-used
+        until the stored session changes.
+        """
+        key = self.get_key(base_url, username)
+        sessions = getattr(self.local, 'sessions', None)
+        if sessions is None:
+            sessions = self.local.sessions = {}
+        with self.lock:
+            generation = self.generations.get(key, 0)
+        cached = sessions.get(key)
+        if cached and cached[0] == generation:
+            return cached[1]
+        cookies = self.get_verified_cookies(base_url, username, login_url,
+                                            http_client)
+        if not cookies:
+            cookies = self.login_http(base_url, username, password, login_url,
+                                      http_client)
+            with self.lock:
+                generation = self.generations.get(key, 0)
+        s = http_client.session(cookies=cookies)
+        sessions[key] = (generation, s)
+        return s
@@ -0,0 +1,198 @@
+"""Status Watcher.
+
+This module contains the ``StatusWatcher`` class, which polls the Archivematica
+dashboard's transfer and ingest status JSON from a single background thread on
+behalf of any number of waiters. A waiter registers a predicate and gets a
+``concurrent.futures.Future`` back; the future is resolved with the first
+non-``None`` value that the predicate returns when called on a fresh status
+snapshot. However many units or waiters there are, the dashboard is polled at
+most once per interval. The interval backs off exponentially (up to a maximum)
+while the statuses do not change and is reset when they change or when a new
+waiter registers.
+"""
+
+from concurrent.futures import Future
+import logging
+import threading
+import time
+
+from . import base
+from . import utils
+
+
+logger = logging.getLogger('amuser.statuswatcher')
+
+
+class ArchivematicaStatusWatcherError(base.ArchivematicaUserError):
+    pass
+
+
+UNIT_TYPES = ('transfer', 'ingest')
+
+
+# Status watchers are process-wide, keyed by dashboard URL and username, so
+# that concurrent scenarios (each with their own ``ArchivematicaUser``) share
+# the same polling loop. Since the watcher outlives the user that created it,
+# every ``get_status_watcher`` call hands it the caller's ``fetch`` callable:
+# the watcher always polls with the fetch of its most recent owner.
+_STATUS_WATCHERS = {}
+_STATUS_WATCHERS_LOCK = threading.Lock()
+
+
+def get_status_watcher(key, fetch, interval, max_interval=None):
+    """Return the process-wide ``StatusWatcher`` for ``key``, creating it with
+    ``interval`` and ``max_interval`` if needed, and make it poll with
+    ``fetch``.
+    """
+    with _STATUS_WATCHERS_LOCK:
+        watcher = _STATUS_WATCHERS.get(key)
+        if watcher is None:
+            watcher = _STATUS_WATCHERS[key] = StatusWatcher(
+                fetch, interval, max_interval=max_interval)
+        else:
+            watcher.fetch = fetch
+        return watcher
+
+
+def stop_status_watchers():
+    with _STATUS_WATCHERS_LOCK:
+        for watcher in _STATUS_WATCHERS.values():
+            watcher.stop()
+
+
+class _Waiter:
+
+    def __init__(self, predicate, unit_types, deadline, description):
+        self.predicate = predicate
+        self.unit_types = unit_types
+        self.deadline = deadline
+        self.description = description
+        self.future = Future()
+
+
+class StatusWatcher:
+    """Polls the dashboard status JSON on behalf of registered waiters.
+    ``fetch`` is a callable that takes a unit type ('transfer' or 'ingest')
+    and returns the list of unit dicts (with their ``jobs``) from the
+    corresponding status JSON. The polling thread is started when the first
+    waiter registers and exits when there are no waiters left. It polls every
+    ``interval`` seconds at first and, while the statuses stay the same,
+    doubles that delay up to ``max_interval`` seconds.
+    """
+
+    def __init__(self, fetch, interval, max_interval=None):
+        self.fetch = fetch
+        self.interval = interval
+        self.max_interval = max(interval, max_interval or interval)
+        # Set when a waiter registers, to poll (and reset the backoff) early.
+        self.wakeup = threading.Event()
+        self.lock = threading.Lock()
+        self.waiters = []
+        self.thread = None
+        self.stopped = False
+
+    def watch(self, predicate, unit_types=UNIT_TYPES, timeout=None,
+              description=None):
+        """Register ``predicate`` and return a future. ``predicate`` is called
+        with a dict mapping each of ``unit_types`` to the list of units in its
+        status JSON; as soon as it returns something other than ``None``, the
+        future is resolved with that value. If ``timeout`` seconds pass first,
+        the future fails with ``ArchivematicaStatusWatcherError``.
+        """
+        deadline = None
+        if timeout is not None:
+            deadline = time.time() + timeout
+        waiter = _Waiter(predicate, tuple(unit_types), deadline,
+                         description or repr(predicate))
+        with self.lock:
+            self.stopped = False
+            self.waiters.append(waiter)
+            self.wakeup.set()
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self.run, name='amuser-status-watcher', daemon=True)
+                self.thread.start()
+        return waiter.future
+
+    def wait(self, predicate, unit_types=UNIT_TYPES, timeout=None,
+             description=None):
+        """Like ``watch`` but block until the future resolves and return its
+        result.
+        """
+        return self.watch(predicate, unit_types=unit_types, timeout=timeout,
+                          description=description).result()
+
+    def stop(self):
+        """Stop polling and cancel all outstanding waiters."""
+        with self.lock:
+            self.stopped = True
+            waiters, self.waiters = self.waiters, []
+        for waiter in waiters:
+            waiter.future.cancel()
+
+    def run(self):
+        last_statuses = None
+        delays = utils.backoff_delays(self.interval, self.max_interval)
+        while True:
+            with self.lock:
+                waiters = [waiter for waiter in self.waiters
+                           if not waiter.future.done()]
+                self.waiters = waiters
+                if not waiters or self.stopped:
+                    self.thread = None
+                    return
+                self.wakeup.clear()
+            statuses = self.poll(waiters)
+            if statuses is None or statuses != last_statuses:
+                delays = utils.backoff_delays(self.interval, self.max_interval)
+                last_statuses = statuses
+            if self.wakeup.wait(next(delays)):
+                delays = utils.backoff_delays(self.interval, self.max_interval)
+
+    def poll(self, waiters):
+        """Fetch the statuses that ``waiters`` need, call their predicates
+        on them and return the statuses (``None`` if fetching failed).
+        """
+        unit_types = {unit_type for waiter in waiters
+                      for unit_type in waiter.unit_types}
+        try:
+            statuses = {unit_type: self.fetch(unit_type)
+                        for unit_type in unit_types}
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning('Unable to fetch unit statuses: %s', exc)
+            statuses = None
+        now = time.time()
+        for waiter in waiters:
+            if waiter.future.done():  # cancelled by ``stop``
+                continue
+            if statuses is not None:
+                try:
+                    result = waiter.predicate(
+                        {unit_type: statuses[unit_type]
+                         for unit_type in waiter.unit_types})
+                except Exception as exc:  # pylint: disable=broad-except
+                    resolve(waiter.future, exception=exc)
+                    continue
+                if result is not None:
+                    resolve(waiter.future, result=result)
+                    continue
+            if waiter.deadline is not None and now > waiter.deadline:
+                resolve(waiter.future,
+                        exception=ArchivematicaStatusWatcherError(
+                            'Timed out waiting for {}'.format(
+                                waiter.description)))
+        return statuses
+
+
+def resolve(future, result=None, exception=None):
+    """Set the result (or ``exception``) of ``future``, unless it has been
+    cancelled (by ``StatusWatcher.stop`` or by the waiter) in the meantime.
+    Claiming the future first means that it cannot be cancelled while we set
+    it, which would raise ``InvalidStateError`` and kill the polling thread.
+    """
+    if not future.set_running_or_notify_cancel():
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
@@ -1,15 +1,22 @@
 AM_URLS = (
     ('get_admin_general_url', '{}administration/general/'),
+    ('get_api_approve_transfer_url', '{}api/transfer/approve/'),
+    ('get_api_completed_units_url', '{}api/{}/completed/'),
+    ('get_api_delete_unit_url', '{}api/{}/{}/delete/'),
+    ('get_api_start_transfer_url', '{}api/transfer/start_transfer/'),
     ('get_aip_in_archival_storage_url', '{}archival-storage/{}/'),
     ('get_archival_storage_url', '{}archival-storage/'),
     ('get_create_command_url', '{}fpr/fpcommand/create/'),
     ('get_create_rule_url', '{}fpr/fprule/create/'),
+    ('get_download_fs_url', '{}filesystem/download_fs/'),
     ('get_edit_default_processing_config_url',
      '{}administration/processing/edit/default/'),
     ('get_handle_config_url', '{}administration/handle/'),
     ('get_ingest_url', '{}ingest/'),
+    ('get_ingest_status_url', '{}ingest/status/'),
     ('get_installer_welcome_url', '{}installer/welcome/'),
     ('get_login_url', '{}administration/accounts/login/'),
+    ('get_mcp_execute_url', '{}mcp/execute/'),
     ('get_metadata_add_url', '{}ingest/{}/metadata/add/'),
     ('get_normalization_report_url', '{}ingest/normalization-report/{}/'),
     ('get_normalization_rules_url', '{}fpr/fprule/normalization/'),
@@ -19,8 +26,10 @@ AM_URLS = (
     ('get_storage_setup_url', '{}installer/storagesetup/'),
     ('get_tasks_url', '{}tasks/{}/'),
     ('get_transfer_backlog_url', '{}backlog/'),
+    ('get_transfer_backlog_search_url', '{}backlog/search/'),
     ('get_appraisal_url', '{}appraisal/'),
     ('get_transfer_url', '{}transfer/'),
+    ('get_transfer_status_url', '{}transfer/status/'),
     ('get_validation_commands_url', '{}fpr/fpcommand/validation/'),
 )
 
@@ -32,6 +41,9 @@ SS_URLS = (
     ('get_location_url', '{}locations/{}/'),
     ('get_locations_url', '{}locations/'),
     ('get_locations_create_url', '{}spaces/{}/location_create/'),
+    ('get_ss_api_file_url', '{}api/v2/file/{}/'),
+    ('get_ss_api_location_browse_url', '{}api/v2/location/{}/browse/'),
+    ('get_ss_api_locations_url', '{}api/v2/location/'),
     ('get_packages_url', '{}packages/'),
     ('get_space_url', '{}spaces/{}/'),
     ('get_space_edit_url', '{}spaces/{}/edit/'),
@@ -1,11 +1,12 @@
 """Utilities for AM User."""
 
 import logging
+import re
 import time
 
 import requests
 
-from . import constants as c
+from . import indexes
 
 
 logger = logging.getLogger('amuser.utils')
@@ -51,15 +52,7 @@ def normalize_ms_name(ms_name, vn):
     to use different names for the same microservice, without us having to
     change a whole bunch of feature files to accommodate such changes.
     """
-    new_ms_name = ms_name
-    if ms_name == 'Approve normalization (review)' and vn != '1.6':
-        new_ms_name = 'Approve normalization Review'
-    elif ms_name == 'Store AIP (review)' and vn != '1.6':
-        new_ms_name = 'Store AIP Review'
-    elif ms_name == 'Store AIP Review' and vn == '1.6':
-        new_ms_name = 'Store AIP (review)'
-    elif ms_name == 'Approve normalization Review' and vn == '1.6':
-        new_ms_name = 'Approve normalization (review)'
+    new_ms_name = indexes.get_ms_name_aliases(vn).get(ms_name, ms_name)
     if ms_name != new_ms_name:
         logger.info('Treating microservice "%s" as "%s"', ms_name, new_ms_name)
     return new_ms_name
@@ -99,32 +92,59 @@ def unixtimestamp():
     return int(time.time())
 
 
-def all_urls_resolve(urls):
+def all_urls_resolve(urls, http_client=None):
     """Return ``True`` only if all URLs in ``urls`` return good status codes
-    when GET-requested.
+    when GET-requested. Pass an ``HTTPClient`` as ``http_client`` to re-use
+    its pooled connections.
     """
+    get = http_client.get if http_client else requests.get
     for purl in urls:
-        r = requests.get(purl)
+        r = get(purl)
         if r.status_code != 200:
             return False
     return True
 
 
+def _iter_html_text(elem, preformatted):
+    if not isinstance(elem.tag, str):  # comments, processing instructions
+        return
+    if elem.tag == 'br':
+        yield '\n'
+    elif elem.text:
+        yield elem.text if preformatted else re.sub(r'\s+', ' ', elem.text)
+    for child in elem:
+        yield from _iter_html_text(child, preformatted)
+        if child.tail:
+            yield (child.tail if preformatted else
+                   re.sub(r'\s+', ' ', child.tail))
+
+
+def get_html_text(elem, preformatted=False):
+    """Return the text of lxml element ``elem`` the way Selenium's ``text``
+    would: ``<br>`` elements become newlines and, unless ``preformatted``,
+    runs of other whitespace collapse to a single space.
+    """
+    text = ''.join(_iter_html_text(elem, preformatted))
+    if not preformatted:
+        text = '\n'.join(line.strip() for line in text.split('\n'))
+    return text.strip()
+
+
+def backoff_delays(initial, maximum, factor=2):
+    """Yield an endless sequence of delays (in seconds) that starts at
+    ``initial`` and grows exponentially by ``factor`` up to ``maximum``.
+    """
+    delay = initial
+    while True:
+        yield delay
+        delay = min(delay * factor, maximum)
+
+
 def micro_service2group(micro_service):
     parts = micro_service.split('|')
     if len(parts) == 2:
         return tuple(parts)
-    map_ = c.MICRO_SERVICES2GROUPS
-    groups = None
-    try:
-        groups = map_[micro_service]
-    except KeyError:
-        for k, v in map_.items():
-            if squash(k) == squash(micro_service):
-                groups = v
-                break
-        if not groups:
-            raise
+    groups = indexes.get_micro_service_groups(micro_service)
     if len(groups) != 1:
         logger.warning('WARNING: the micro-service "%s" belongs to multiple'
                        ' micro-service groups; returning "%s"',
@@ -1,2 +1,11 @@
 #!/usr/bin/env bash
-behave --tags=close-all-transfers --no-skipped $@
+# Closes all transfers. Pass ``-D am_api_key=<KEY>`` to close the completed ones in
+# bulk using the dashboard API (i.e., with ``-D unit_removal_backend=api``)
+# instead of one at a time in the browser.
+backend=()
+for arg in "$@"; do
+    case "$arg" in
+        *am_api_key=*) backend=(-D unit_removal_backend=api) ;;
+    esac
+done
+behave --tags=close-all-transfers --no-skipped "${backend[@]}" $@
@@ -2,6 +2,9 @@ import logging
 import os
 
 import amuser
+from amuser import http_client
+from amuser import selenium_ability
+from amuser import status_watcher
 import utils
 
 
@@ -27,6 +30,45 @@ SS_API_KEY = None
 TRANSFER_SOURCE_PATH = 'vagrant/archivematica-sampledata/TestTransfers/acceptance-tests'
 HOME = ''
 DRIVER_NAME = 'Chrome'
+# Maximum number of browsers that may be open at the same time. Browsers are
+# pooled and re-used across scenarios.
+MAX_DRIVERS = 3
+# Set to ``True`` to run headless browsers that do not load images or fonts.
+HEADLESS = False
+# Set to ``True`` to save authenticated dashboard and Storage Service sessions
+# to disk so that subsequent runs do not need to log in again.
+PERSIST_SESSIONS = False
+# Set to 'http' to parse the tasks pages of jobs from their HTML, without a
+# browser; 'browser' scrapes them with Selenium.
+TASKS_PARSER = 'browser'
+# Maximum number of tasks pages that the 'http' tasks parser fetches at once.
+MAX_TASKS_PAGE_FETCHERS = 8
+# Set to 'api' to wait for jobs by polling the dashboard's status JSON instead
+# of watching the Transfer and Ingest tabs in the browser.
+JOB_WAIT_BACKEND = 'browser'
+# Set to 'api' to start and approve transfers using the dashboard API (which
+# requires ``am_api_key``) instead of the Transfer tab.
+TRANSFER_START_BACKEND = 'browser'
+# Set to 'api' to close all transfers or SIPs using the dashboard API (which
+# requires ``am_api_key``). Note that the API only removes completed units,
+# whereas the browser removes every unit in the Transfer or Ingest tab.
+UNIT_REMOVAL_BACKEND = 'browser'
+# Set to 'api' to wait for AIPs to be stored by polling the Storage Service API
+# instead of searching the Archival Storage tab (and for DIPs to appear in the
+# transfer backlog by polling the backlog search JSON). Set AIP_WAIT_GUI_CHECK to
+# ``True`` to search the Archival Storage tab once the AIP is stored anyway.
+AIP_WAIT_BACKEND = 'browser'
+AIP_WAIT_GUI_CHECK = False
+# Maximum number of kept-alive HTTP connections per host (dashboard, SS) and
+# number of times idempotent HTTP requests are retried on connection or gateway
+# errors.
+MAX_HTTP_CONNECTIONS = 10
+HTTP_RETRIES = 3
+# Number of byte ranges that large AIPs are downloaded as, in parallel.
+AIP_DOWNLOAD_SEGMENTS = 1
+# Set to ``True`` to verify the checksums of downloaded (compressed,
+# unencrypted) AIPs against the fixity in their pointer files.
+VERIFY_AIP_DOWNLOADS = False
 AUTOMATION_TOOLS_PATH = '/etc/archivematica/automation-tools'
 # Set these constants if the AM client should be able to gain SSH access to the
 # server where AM is being served. This is needed in order to scp server files
@@ -74,6 +116,28 @@ def get_am_user(userdata):
         'ss_url': userdata.get('ss_url', SS_URL),
         'ss_api_key': userdata.get('ss_api_key', SS_API_KEY),
         'driver_name': userdata.get('driver_name', DRIVER_NAME),
+        'max_drivers': userdata.getint('max_drivers', MAX_DRIVERS),
+        'headless': userdata.getbool('headless', HEADLESS),
+        'persist_sessions': userdata.getbool(
+            'persist_sessions', PERSIST_SESSIONS),
+        'tasks_parser': userdata.get('tasks_parser', TASKS_PARSER),
+        'max_tasks_page_fetchers': userdata.getint(
+            'max_tasks_page_fetchers', MAX_TASKS_PAGE_FETCHERS),
+        'job_wait_backend': userdata.get('job_wait_backend', JOB_WAIT_BACKEND),
+        'transfer_start_backend': userdata.get(
+            'transfer_start_backend', TRANSFER_START_BACKEND),
+        'unit_removal_backend': userdata.get(
+            'unit_removal_backend', UNIT_REMOVAL_BACKEND),
+        'aip_wait_backend': userdata.get('aip_wait_backend', AIP_WAIT_BACKEND),
+        'aip_wait_gui_check': userdata.getbool(
+            'aip_wait_gui_check', AIP_WAIT_GUI_CHECK),
+        'max_http_connections': userdata.getint(
+            'max_http_connections', MAX_HTTP_CONNECTIONS),
+        'http_retries': userdata.getint('http_retries', HTTP_RETRIES),
+        'aip_download_segments': userdata.getint(
+            'aip_download_segments', AIP_DOWNLOAD_SEGMENTS),
+        'verify_aip_downloads': userdata.getbool(
+            'verify_aip_downloads', VERIFY_AIP_DOWNLOADS),
         'ssh_accessible': bool(
             userdata.get('ssh_accessible', SSH_ACCESSIBLE)),
         'ssh_requires_password': bool(
@@ -141,11 +205,21 @@ def before_all(context):
     logger.addHandler(file_handler)
 
 
+def after_all(context):
+    """Quit all of the pooled Selenium drivers, stop watching unit statuses
+    and log how long our HTTP requests took.
+    """
+    selenium_ability.close_driver_pools()
+    status_watcher.stop_status_watchers()
+    http_client.log_http_timings()
+
+
 def before_scenario(context, scenario):
-    """Instantiate an ``ArchivematicaUser`` instance. The ``ArchivematicaUser``
-    instance creates many drivers/browsers. If we don't destroy then in between
-    scenarios, we end up with too many and it causes the tests to fail. That is
-    why we are using ``before_scenario`` here and not ``before_all``.
+    """Instantiate an ``ArchivematicaUser`` instance. A fresh
+    ``ArchivematicaUser`` is created for each scenario; its browsers, however,
+    are checked out of a driver pool that is shared across scenarios (and
+    capped at ``max_drivers``) so that we do not pay for starting a new browser
+    every time.
     """
     userdata = context.config.userdata
     context.am_user = get_am_user(userdata)
@@ -159,7 +233,7 @@ def before_scenario(context, scenario):
 
 
 def after_scenario(context, scenario):
-    """Close all browser windows/Selenium drivers."""
+    """Return all Selenium drivers to the driver pool."""
     # In the following scenario, we've created a weird FPR rule. Here we put
     # things back as they were: make access .mov files normalize to .mp4
     if scenario.name == ('Isla wants to confirm that normalization to .mkv for'
@@ -416,9 +416,8 @@ def step_impl(context, validation_result):
       ' eventOutcome = {event_outcome}')
 def step_impl(context, event_outcome):
     events = []
-    for e in context.am_user.mets.get_premis_events(context.am_user.browser.get_mets(
-            context.scenario.transfer_name,
-            context.am_user.browser.get_sip_uuid(context.scenario.transfer_name))):
+    for e in context.am_user.mets.get_premis_events(
+            utils.get_mets_from_scenario(context)):
         if (e['event_type'] == 'validation' and
                 e['event_detail'].startswith(MC_EVENT_DETAIL_PREFIX) and
                 e['event_outcome_detail_note'].startswith(
@@ -445,41 +444,23 @@ def step_impl(context, microservice_output):
 
 @then('all policy check for access derivatives tasks indicate {event_outcome}')
 def step_impl(context, event_outcome):
-    policy_check_tasks = [t for t in context.scenario.job['tasks'].values() if
-                          t['stdout'].startswith(
-                              'Running Check against policy ')]
-    assert policy_check_tasks
-    if event_outcome == 'pass':
-        for task in policy_check_tasks:
-            assert 'All policy checks passed:' in task['stdout']
-            assert task['exit_code'] == '0'
-    else:
-        for task in policy_check_tasks:
-            assert '"eventOutcomeInformation": "fail"' in task['stdout']
+    utils.assert_policy_check_tasks(
+        context, 'Policy checks for access derivatives', 'ingest',
+        event_outcome)
 
 
 @then('all policy check for originals tasks indicate {event_outcome}')
 def step_impl(context, event_outcome):
-    policy_check_tasks = [t for t in context.scenario.job['tasks'].values() if
-                          t['stdout'].startswith(
-                              'Running Check against policy ')]
-    assert policy_check_tasks
-    if event_outcome == 'pass':
-        for task in policy_check_tasks:
-            assert 'All policy checks passed:' in task['stdout']
-            assert task['exit_code'] == '0'
-    else:
-        for task in policy_check_tasks:
-            assert '"eventOutcomeInformation": "fail"' in task['stdout']
+    utils.assert_policy_check_tasks(
+        context, 'Policy checks for originals', 'transfer', event_outcome)
 
 
 @then('all PREMIS policy-check-type validation events have eventOutcome ='
       ' {event_outcome}')
 def step_impl(context, event_outcome):
     events = []
-    for e in context.am_user.mets.get_premis_events(context.am_user.browser.get_mets(
-            context.scenario.transfer_name,
-            context.am_user.browser.get_sip_uuid(context.scenario.transfer_name))):
+    for e in context.am_user.mets.get_premis_events(
+            utils.get_mets_from_scenario(context)):
         if (e['event_type'] == 'validation' and
                 e['event_detail'].startswith(MC_EVENT_DETAIL_PREFIX) and
                 e['event_outcome_detail_note'].startswith(
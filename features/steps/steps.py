@@ -11,6 +11,26 @@ from features.steps import utils
 logger = logging.getLogger('amauat.steps')
 
 
+# Decision points (and choices) of the "standard AIP-creation decisions are
+# made" step, for answering them through the dashboard in any order.
+STANDARD_AIP_CREATION_DECISIONS = {
+    'Assign UUIDs to directories?': 'No',
+    'Select file format identification command|Identify file format':
+        'Identify using Siegfried',
+    'Perform policy checks on originals?': 'No',
+    'Create SIP(s)': 'Create single SIP and continue processing',
+    'Normalize': 'Normalize for preservation',
+    'Approve normalization (review)': 'Approve',
+    'Perform policy checks on preservation derivatives?': 'No',
+    'Perform policy checks on access derivatives?': 'No',
+    'Select file format identification command|'
+    'Process submission documentation': 'Identify using Siegfried',
+    'Bind PIDs?': 'No',
+    'Document empty directories?': 'No',
+    'Store AIP (review)': 'Store AIP',
+}
+
+
 # Givens
 # ------------------------------------------------------------------------------
 
@@ -229,7 +249,8 @@ def step_impl(context, choice, decision_point, unit_type):
 def step_impl(context):
     uuid_val = utils.get_uuid_val(context, 'sip')
     context.am_user.browser.wait_for_aip_in_archival_storage(uuid_val)
-    time.sleep(context.am_user.medium_wait)
+    if context.am_user.aip_wait_backend != 'api':
+        time.sleep(context.am_user.medium_wait)
 
 
 @when('the user searches for the AIP UUID in the Storage Service')
@@ -312,6 +333,7 @@ def step_impl(context):
 @when('the user initiates a {reingest_type} re-ingest on the AIP')
 def step_impl(context, reingest_type):
     uuid_val = utils.get_uuid_val(context, 'sip')
+    context.am_user.mets.forget_mets(uuid_val)
     context.am_user.browser.initiate_reingest(
         uuid_val, reingest_type=reingest_type)
 
@@ -325,7 +347,15 @@ def step_impl(context):
     - create SIP
     - normalize for preservation
     - store AIP
+
+    When waiting for jobs via the API, all of these decisions are answered
+    through the dashboard as soon as they appear, in whatever order.
     """
+    if context.am_user.job_wait_backend == 'api':
+        responder = context.am_user.respond_to_decisions(
+            STANDARD_AIP_CREATION_DECISIONS, [context.scenario.transfer_name])
+        context.scenario.answered_decisions = responder.wait()
+        return
     context.execute_steps(
         'When the user waits for the "Assign UUIDs to directories?" decision'
         ' point to appear and chooses "No" during transfer\n'
@@ -378,7 +408,12 @@ def step_impl(context, transfer_path):
 
 @when('the user closes all {unit_type}')
 def step_impl(context, unit_type):
-    getattr(context.am_user.browser, 'remove_all_' + unit_type)()
+    # The dashboard API removes completed units in bulk but, unlike the
+    # browser, it leaves units that are still processing; so it is opt-in.
+    ability = context.am_user.browser
+    if context.am_user.unit_removal_backend == 'api':
+        ability = context.am_user.api
+    getattr(ability, 'remove_all_' + unit_type)()
 
 
 @when('the AIP is deleted')
@@ -74,9 +74,7 @@ def get_event_attr(event_type):
 
 
 def get_mets_from_scenario(context):
-    return context.am_user.browser.get_mets(
-        context.scenario.transfer_name,
-        context.am_user.browser.get_sip_uuid(context.scenario.transfer_name))
+    return context.am_user.get_mets(context.scenario.transfer_name)
 
 
 def assert_premis_event(event_type, event, context):
@@ -138,7 +136,7 @@ def initiate_transfer(context, transfer_path, accession_no=None,
     context.scenario.transfer_name = context.am_user.browser.unique_name(
         transfer_path2name(transfer_path))
     context.scenario.transfer_uuid, context.scenario.transfer_name = (
-        context.am_user.browser.start_transfer(
+        context.am_user.start_transfer(
             context.scenario.transfer_path, context.scenario.transfer_name,
             accession_no=accession_no, transfer_type=transfer_type))
 
@@ -154,6 +152,39 @@ def ingest_ms_output_is(name, output, context):
     assert context.scenario.job.get('job_output') == output
 
 
+def assert_policy_check_tasks(context, ms_name, unit_type, event_outcome):
+    """Assert that all of the policy check tasks of the job of micro-service
+    ``ms_name`` indicate ``event_outcome`` ('pass' or 'fail'). If a previous
+    step already parsed that job into ``context.scenario.job`` its tasks are
+    re-used; otherwise they are streamed from the dashboard, so we stop at the
+    first offending task.
+    """
+    unit_type = get_normalized_unit_type(unit_type)
+    unit_uuid = get_uuid_val(context, unit_type)
+    job = getattr(context.scenario, 'job', None)
+    if (job and job.get('ms_name') == ms_name and
+            job.get('unit_uuid') == unit_uuid):
+        tasks = job['tasks'].values()
+    else:
+        tasks = context.am_user.browser.iter_job_tasks(
+            ms_name, unit_uuid, unit_type=unit_type, with_output=True)
+    policy_check_task_count = 0
+    for task in tasks:
+        if not task['stdout'].startswith('Running Check against policy '):
+            continue
+        policy_check_task_count += 1
+        if event_outcome == 'pass':
+            assert 'All policy checks passed:' in task['stdout'], (
+                'Policy check task {} did not pass'.format(task['task_uuid']))
+            assert task['exit_code'] == '0', (
+                'Policy check task {} has exit code {}'.format(
+                    task['task_uuid'], task['exit_code']))
+        else:
+            assert '"eventOutcomeInformation": "fail"' in task['stdout'], (
+                'Policy check task {} did not fail'.format(task['task_uuid']))
+    assert policy_check_task_count
+
+
 def debag(paths):
     """Given an array of paths like::
 
@@ -212,11 +243,16 @@ def all_normalization_report_columns_are(column, expected_value, context):
     """Wait for the normalization report to be generated then assert that all
     values in ``column`` have value ``expected_value``.
     """
-    normalization_report = context.am_user.browser.parse_normalization_report(
+    columns = context.am_user.browser.get_normalization_report_columns(
         context.scenario.sip_uuid)
-    for file_dict in normalization_report:
-        if file_dict['file_format'] != 'None':
-            assert file_dict[column] == expected_value
+    mismatches = [
+        (file_format, value)
+        for file_format, value in zip(columns['file_format'], columns[column])
+        if file_format != 'None' and value != expected_value]
+    assert not mismatches, (
+        '{} of the {} normalization report rows have a {} value other than'
+        ' {}: {}'.format(len(mismatches), len(columns[column]), column,
+                         expected_value, mismatches))
 
 
 def transfer_path2name(transfer_path):
@@ -5,7 +5,11 @@ Feature: The user can close all units
   development of tests, i.e., the ability to close a bunch of units, i.e.,
   transfers or ingests. Note also that with Archivematica 1.7 this feature
   should no longer be needed because the dashboard will have "close all
-  transfers" and "close all ingests" buttons.
+  transfers" and "close all ingests" buttons. With
+  ``-D unit_removal_backend=api`` and an Archivematica API key
+  (``-D am_api_key=<KEY>``), only the completed units are closed, in bulk via
+  the dashboard API; the close_all_transfers.sh and close_all_ingests.sh
+  scripts do this whenever they are given an API key.
 
   @close-all-transfers
   Scenario: Isla wants to close all transfers